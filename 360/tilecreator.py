@@ -3,45 +3,90 @@
 tilecreator.py — Generate krpano-compatible multires cube tiles from equirectangular panoramas.
 
 Usage:
-    python3 tilecreator.py <equirectangular.jpg> [<image2.jpg> ...]
+    python3 tilecreator.py [-j N] <equirectangular.jpg> [<image2.jpg> ...]
 
 Output:
     {stem}.tiles/ directory next to each input image, containing:
       preview.jpg, thumb.jpg, and f/b/l/r/u/d tile directories.
 
 Dependencies: Pillow, numpy (both standard in scientific Python environments)
+Optional:     numba — fused multi-threaded projection kernel (much faster)
+              opencv-python — cv2.remap projection when numba is absent
+              cupy — CUDA projection on an NVIDIA GPU
+              PyTurboJPEG + libturbojpeg — faster JPEG decoding and tile encoding
 
 Memory note: Processing a 25 MP panorama (25000×12500) at maximum quality
-requires approximately 6–10 GB of RAM. Smaller panoramas need proportionally less.
+requires approximately 6–10 GB of RAM with the NumPy projection. With numba
+installed the projection allocates nothing beyond the output face, but the six
+faces run in parallel workers: peak RAM is the decoded source (shared by all
+workers) plus, per worker, its face and that face's next pyramid level.
+--jobs N multiplies this by N.
 """
 
 import sys
 import math
 import os
 import argparse
+import contextlib
+import functools
+import io
 import json
+import multiprocessing
 import shutil
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 
 import numpy as np
 from PIL import Image
 
+try:
+    from numba import get_num_threads, njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # optional — fall back to the vectorised NumPy projection
+    HAVE_NUMBA = False
+
+try:
+    import cv2
+    HAVE_CV2 = True
+except ImportError:  # optional — OpenCV's remap is used when numba is absent
+    HAVE_CV2 = False
+
+try:
+    import cupy as cp
+    HAVE_CUPY = True
+except ImportError:  # optional — CUDA projection when a GPU is present
+    HAVE_CUPY = False
+
+try:
+    from turbojpeg import TJPF_RGB, TJSAMP_420, TurboJPEG
+    _tj = TurboJPEG()
+except Exception:  # optional — PyTurboJPEG or libturbojpeg missing, Pillow encodes
+    _tj = None
+
 # Disable PIL's decompression bomb guard so large panoramas can be opened
 Image.MAX_IMAGE_PIXELS = None
 
 # ── Constants ────────────────────────────────────────────────────────────────
 TILE_SIZE = 512                              # px; also the first value in multires attr
 FACES = ['f', 'b', 'r', 'l', 'u', 'd']
+FACE_IDS = {face: i for i, face in enumerate(FACES)}   # integer ids for the JIT kernel
+KERNEL_BLOCK = 64                            # px; output block edge in the JIT kernel
+CV2_MAX_SOURCE = 32767                       # cv2.remap keeps source coords in int16
 PREVIEW_FACE_ORDER = ['l', 'f', 'r', 'b', 'u', 'd']  # krpano cube-strip order
 PREVIEW_FACE_SIZE = 256                      # each face in preview.jpg
 JPEG_QUALITY = 90
+LANCZOS_REDUCING_GAP = 3.0                   # Pillow: box-reduce first on big downscales
+DECODE_STRIP_ROWS = 256                      # rows per strip when decoding the source
 
 
 # ── Level-size computation ────────────────────────────────────────────────────
 
-def compute_level_sizes(width: int) -> list[int]:
+@functools.lru_cache(maxsize=None)
+def compute_level_sizes(width: int) -> tuple[int, ...]:
     """
-    Return ascending list of cube-face sizes for each multires level.
+    Return ascending tuple of cube-face sizes for each multires level.
 
     Matches the level-generation behaviour of the krpano tool exactly:
 
@@ -63,15 +108,192 @@ def compute_level_sizes(width: int) -> list[int]:
     while current > TILE_SIZE:
         levels.append(current)
         current = (current // 256) * 128   # halve, then floor to nearest 128
-    return sorted(levels)
+    return tuple(sorted(levels))
+
+
+def tiles_per_side(level_size: int) -> int:
+    """Number of tile rows (= columns) in a level: full tiles plus a partial edge tile."""
+    n_full = level_size // TILE_SIZE
+    return n_full + (1 if level_size % TILE_SIZE else 0)
+
+
+def make_tile_dirs(out_dir: str, level_sizes: tuple[int, ...]) -> None:
+    """
+    Create every face/level/row directory of the tile tree in one sweep, so the
+    tile writers never have to stat or mkdir on the way.
+    """
+    for face in FACES:
+        for li, size in enumerate(level_sizes, start=1):
+            for row in range(tiles_per_side(size)):
+                os.makedirs(os.path.join(out_dir, face, f"l{li}", f"{row + 1:02d}"),
+                            exist_ok=True)
 
 
 # ── Equirectangular → cube-face projection ───────────────────────────────────
 
+# float32 minimax coefficients: atan(a) on [0, 1] (|err| < 2e-6 rad) and
+# Abramowitz & Stegun 4.4.46 for asin (|err| < 2e-8 rad).  Tuples, so numba
+# folds them in as compile-time constants.
+_ATAN_COEFFS = (np.float32(0.99997726), np.float32(-0.33262347), np.float32(0.19354346),
+                np.float32(-0.11643287), np.float32(0.05265332), np.float32(-0.01172120))
+_ASIN_COEFFS = (np.float32(1.5707963050), np.float32(-0.2145988016), np.float32(0.0889789874),
+                np.float32(-0.0501743046), np.float32(0.0308918810), np.float32(-0.0170881256),
+                np.float32(0.0066700901), np.float32(-0.0012624911))
+
+
+if HAVE_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _atan2_f32(y, x):
+        """Polynomial float32 atan2 — a few FMAs instead of a libm call."""
+        c = _ATAN_COEFFS
+        ax = abs(x)
+        ay = abs(y)
+        a = min(ax, ay) / max(ax, ay, np.float32(1e-30))
+        s = a * a
+        r = a * (c[0] + s * (c[1] + s * (c[2] + s * (c[3] + s * (c[4] + s * c[5])))))
+        if ay > ax:
+            r = np.float32(math.pi / 2) - r
+        if x < 0:
+            r = np.float32(math.pi) - r
+        return math.copysign(r, y)
+
+    @njit(fastmath=True, cache=True)
+    def _asin_f32(v):
+        """Polynomial float32 arcsin for v ∈ [-1, 1]."""
+        c = _ASIN_COEFFS
+        a = abs(v)
+        p = c[0] + a * (c[1] + a * (c[2] + a * (c[3] + a * (c[4] + a * (c[5] + a * (c[6] + a * c[7]))))))
+        return math.copysign(np.float32(math.pi / 2) - math.sqrt(np.float32(1.0) - a) * p, v)
+
+    @njit(parallel=True, fastmath=True, cache=True, boundscheck=False)
+    def _project_face(img, face_id, out):
+        """
+        Fused per-pixel projection kernel: direction → lon/lat → bilinear sample.
+
+        Same maths as the NumPy path below, but every intermediate lives in
+        registers, so the only array written is the (size, size, 3) uint8 output.
+        img is the padded source (see _fill_border).
+        """
+        H, W = img.shape[0] - 2, img.shape[1] - 2
+        size = out.shape[0]
+        step = np.float32(2.0) / np.float32(max(size - 1, 1))
+        inv_pi = np.float32(1.0 / math.pi)
+        half_w = np.float32(0.5) * np.float32(W - 1)
+        h1 = np.float32(H - 1)
+        one = np.float32(1.0)
+
+        # 64×64 output blocks: neighbouring output pixels sample neighbouring
+        # source pixels, so a block's source footprint stays cache-resident
+        nb = (size + KERNEL_BLOCK - 1) // KERNEL_BLOCK
+        for b in prange(nb * nb):
+            bj = (b // nb) * KERNEL_BLOCK
+            bi = (b % nb) * KERNEL_BLOCK
+            for j in range(bj, min(bj + KERNEL_BLOCK, size)):
+                v = one - np.float32(j) * step
+                for i in range(bi, min(bi + KERNEL_BLOCK, size)):
+                    u = np.float32(i) * step - one
+
+                    # Direction vector (same table as the NumPy path)
+                    if face_id == 0:      # f
+                        dx, dy, dz = u, v, one
+                    elif face_id == 1:    # b
+                        dx, dy, dz = -u, v, -one
+                    elif face_id == 2:    # r
+                        dx, dy, dz = one, v, -u
+                    elif face_id == 3:    # l
+                        dx, dy, dz = -one, v, u
+                    elif face_id == 4:    # u
+                        dx, dy, dz = u, one, -v
+                    else:                 # d
+                        dx, dy, dz = u, -one, v
+
+                    # atan2 is scale-invariant, so only dy needs normalising
+                    lon = _atan2_f32(dx, dz)
+                    lat = _asin_f32(min(max(dy / math.sqrt(dx * dx + dy * dy + dz * dz), -one), one))
+
+                    px = (lon * inv_pi + one) * half_w
+                    py = (np.float32(0.5) - lat * inv_pi) * h1
+
+                    fx = math.floor(px)
+                    fy = math.floor(py)
+                    # Q0.8 fixed-point weights (0‥256)
+                    wx = int((px - fx) * np.float32(256.0) + np.float32(0.5))
+                    wy = int((py - fy) * np.float32(256.0) + np.float32(0.5))
+                    iwx = 256 - wx
+                    iwy = 256 - wy
+
+                    # +1 for the border: no wrap or clamp needed
+                    x0 = int(fx) + 1
+                    y0 = int(fy) + 1
+                    x1 = x0 + 1
+                    y1 = y0 + 1
+
+                    # Separable integer blend, identical to the NumPy path
+                    for c in range(3):
+                        top = (img[y0, x0, c] * iwx + img[y0, x1, c] * wx + 128) >> 8
+                        bot = (img[y1, x0, c] * iwx + img[y1, x1, c] * wx + 128) >> 8
+                        out[j, i, c] = (top * iwy + bot * wy) >> 8
+
+
+# CUDA port of _project_face for CuPy: one thread per output pixel, same
+# direction table, padded-source indexing and Q0.8 separable blend.
+_CUDA_SRC = r"""
+extern "C" __global__
+void project_face(const unsigned char* src, int H, int W, int face_id,
+                  unsigned char* out, int size)
+{
+    int i = blockIdx.x * blockDim.x + threadIdx.x;
+    int j = blockIdx.y * blockDim.y + threadIdx.y;
+    if (i >= size || j >= size) return;
+
+    float step = 2.0f / (float)max(size - 1, 1);
+    float u = i * step - 1.0f;
+    float v = 1.0f - j * step;
+    float dx, dy, dz;
+    switch (face_id) {
+        case 0:  dx = u;     dy = v;     dz = 1.0f;  break;   // f
+        case 1:  dx = -u;    dy = v;     dz = -1.0f; break;   // b
+        case 2:  dx = 1.0f;  dy = v;     dz = -u;    break;   // r
+        case 3:  dx = -1.0f; dy = v;     dz = u;     break;   // l
+        case 4:  dx = u;     dy = 1.0f;  dz = -v;    break;   // u
+        default: dx = u;     dy = -1.0f; dz = v;     break;   // d
+    }
+
+    const float inv_pi = 0.318309886f;
+    float lon = atan2f(dx, dz);
+    float lat = asinf(fminf(fmaxf(dy * rsqrtf(dx * dx + dy * dy + dz * dz), -1.0f), 1.0f));
+    float px = (lon * inv_pi + 1.0f) * 0.5f * (float)(W - 1);
+    float py = (0.5f - lat * inv_pi) * (float)(H - 1);
+
+    float fx = floorf(px);
+    float fy = floorf(py);
+    int wx = (int)((px - fx) * 256.0f + 0.5f);
+    int wy = (int)((py - fy) * 256.0f + 0.5f);
+
+    // +1 for the border: no wrap or clamp needed
+    long long row = 3LL * (W + 2);
+    const unsigned char* p00 = src + ((long long)fy + 1) * row + ((long long)fx + 1) * 3;
+    const unsigned char* p01 = p00 + row;
+    unsigned char* o = out + ((long long)j * size + i) * 3;
+    for (int c = 0; c < 3; ++c) {
+        int top = (p00[c] * (256 - wx) + p00[c + 3] * wx + 128) >> 8;
+        int bot = (p01[c] * (256 - wx) + p01[c + 3] * wx + 128) >> 8;
+        o[c] = (unsigned char)((top * (256 - wy) + bot * wy) >> 8);
+    }
+}
+"""
+
+if HAVE_CUPY:
+    _project_face_cuda = cp.RawKernel(_CUDA_SRC, 'project_face')   # compiled on first launch
+
+
 def equirect_to_face(img_np: np.ndarray, face: str, size: int) -> Image.Image:
     """
     Project an equirectangular image onto one cube face using bilinear interpolation.
 
+    Uses CuPy on a CUDA GPU when available, else the fused Numba kernel,
+    else OpenCV's remap, else the NumPy path.
+
     Coordinate system (right-handed, krpano convention):
         +Z = front   +X = right   +Y = up
 
@@ -83,107 +305,343 @@ def equirect_to_face(img_np: np.ndarray, face: str, size: int) -> Image.Image:
     Returns:
         PIL Image (RGB, size × size)
     """
+    return Image.fromarray(_face_array(_padded(img_np), face, size))
+
+
+def _fill_border(src: np.ndarray) -> None:
+    """
+    Fill the one-pixel border of a padded (H+2, W+2, 3) source in place.
+
+    The panorama sits in src[1:-1, 1:-1].  The left/right border columns
+    repeat the opposite edge (longitude wraps) and the top/bottom rows repeat
+    the adjacent row (latitude clamps), so every bilinear neighbour of a
+    source coordinate in [0, W-1] × [0, H-1] is a plain +1 offset — the
+    samplers need no modulo or clip passes.
+    """
+    src[1:-1, 0] = src[1:-1, -2]
+    src[1:-1, -1] = src[1:-1, 1]
+    src[0] = src[1]
+    src[-1] = src[-2]
+
+
+def _padded(img_np: np.ndarray) -> np.ndarray:
+    """Copy an (H, W, 3) array into a new padded source (see _fill_border)."""
     H, W = img_np.shape[:2]
+    src = np.empty((H + 2, W + 2, 3), dtype=np.uint8)
+    src[1:-1, 1:-1] = img_np
+    _fill_border(src)
+    return src
 
-    # UV grids: u from -1 (left) to +1 (right), v from +1 (top) to -1 (bottom)
-    u = np.linspace(-1.0, 1.0, size, dtype=np.float32)
-    v = np.linspace(1.0, -1.0, size, dtype=np.float32)
-    uu, vv = np.meshgrid(u, v)   # shape (size, size), float32
-    del u, v
-
-    # 3-D direction vectors for the requested face
-    # (Unary minus on an ndarray creates a new array, so uu/vv may be aliased
-    #  into dx/dy/dz but that is safe — we del them all before normalization.)
-    if face == 'f':    # Front  +Z: screen-right → +X, screen-up → +Y
-        dx, dy, dz = uu, vv, np.ones((size, size), dtype=np.float32)
-    elif face == 'b':  # Back   -Z: screen-right → -X (flipped), screen-up → +Y
-        dx, dy, dz = -uu, vv, np.full((size, size), -1.0, dtype=np.float32)
-    elif face == 'r':  # Right  +X: screen-right → -Z (front = left edge), up → +Y
-        dx, dy, dz = np.ones((size, size), dtype=np.float32), vv, -uu
-    elif face == 'l':  # Left   -X: screen-right → +Z (front = right edge), up → +Y
-        dx, dy, dz = np.full((size, size), -1.0, dtype=np.float32), vv, uu
-    elif face == 'u':  # Up     +Y: screen-right → +X, screen-top → -Z (back)
-        dx, dy, dz = uu, np.ones((size, size), dtype=np.float32), -vv
-    elif face == 'd':  # Down   -Y: screen-right → +X, screen-top → +Z (front)
-        dx, dy, dz = uu, np.full((size, size), -1.0, dtype=np.float32), vv
-    else:
+
+def _face_array(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """
+    equirect_to_face on an already padded source (see _fill_border),
+    returning the (size, size, 3) uint8 array itself.
+    """
+    global HAVE_CUPY
+    if face not in FACE_IDS:
         raise ValueError(f"Unknown face identifier: {face!r}")
 
-    del uu, vv  # free original grids (data lives on via dx/dy/dz if aliased)
+    if HAVE_CUPY and _gpu_available():
+        try:
+            return _equirect_to_face_gpu(src, face, size)
+        except Exception as exc:    # NVRTC compile, driver or out-of-memory error
+            print(f"WARNING: GPU projection of face '{face}' failed ({exc}); "
+                  f"using the CPU from now on", file=sys.stderr)
+            HAVE_CUPY = False
 
-    # Normalise to unit sphere
-    norm = np.sqrt(dx * dx + dy * dy + dz * dz)
-    dx /= norm
-    dy /= norm
-    dz /= norm
-    del norm
+    if HAVE_NUMBA:
+        out = np.empty((size, size, 3), dtype=np.uint8)
+        _project_face(src, FACE_IDS[face], out)
+        return out
 
-    # Convert to spherical longitude / latitude
-    lon = np.arctan2(dx, dz).astype(np.float32)          # ∈ [-π, π]
-    lat = np.arcsin(np.clip(dy, -1.0, 1.0)).astype(np.float32)  # ∈ [-π/2, π/2]
-    del dx, dy, dz
+    if HAVE_CV2 and max(src.shape[:2]) < CV2_MAX_SOURCE:
+        return _equirect_to_face_cv2(src, face, size)
+
+    return _equirect_to_face_np(src, face, size)
+
+
+def _compile_kernel() -> None:
+    """
+    Run the numba kernel once on a tiny input so it lands in the on-disk
+    cache.  main() calls this once in a short-lived helper process, so the
+    face workers all load the cached machine code instead of each compiling
+    the same kernel concurrently on a cold cache (~2 s apiece).  It is not
+    run in the main process: numba's thread pool, started by the first
+    parallel call, does not survive being forked into the workers.
+    """
+    _project_face(np.zeros((4, 4, 3), dtype=np.uint8), 0,
+                  np.empty((1, 1, 3), dtype=np.uint8))
+
+
+@functools.lru_cache(maxsize=2)
+def _base_angles(polar: bool, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Longitude / latitude grids for the front face (polar=False) or the up face
+    (polar=True).  Only these two need trig; the other four faces are cheap
+    transforms of them (see _face_angles).  Cached per size, so the faces a
+    worker projects share them; each worker process keeps its own cache.
+    The arrays are read-only.
+
+    The direction vector (u, v, 1) or (u, 1, -v) is never materialised: the
+    normalisation cancels inside arctan2, so each angle is a single ufunc over
+    the broadcast 1-D u/v axes.  The front face's longitude depends on u alone
+    and is returned as a broadcast view of one row.
+    """
+    # u from -1 (left) to +1 (right), v from +1 (top) to -1 (bottom)
+    u = np.linspace(-1.0, 1.0, size, dtype=np.float32)[np.newaxis, :]
+    v = np.linspace(1.0, -1.0, size, dtype=np.float32)[:, np.newaxis]
+
+    if polar:   # Up     +Y: screen-right → +X, screen-top → -Z (back)
+        lon = np.arctan2(u, -v)                               # ∈ [-π, π]
+        lat = np.arctan2(np.float32(1.0), np.hypot(u, v))     # ∈ (0, π/2]
+    else:       # Front  +Z: screen-right → +X, screen-up → +Y
+        lon = np.broadcast_to(np.arctan(u), (size, size))
+        lat = np.arctan2(v, np.sqrt(u * u + np.float32(1.0)))
+
+    lon.setflags(write=False)
+    lat.setflags(write=False)
+    return lon, lat
+
+
+def _face_angles(face: str, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Longitude / latitude grids for any face, derived from _base_angles:
+
+        b, r, l  share the front face's latitude; longitude is offset by
+                 π, +π/2 and -π/2 respectively (b wraps back into [-π, π])
+        d        is the up face flipped vertically with latitude negated
+    """
+    if face in ('u', 'd'):
+        lon, lat = _base_angles(True, size)
+        if face == 'd':
+            lon, lat = lon[::-1], -lat[::-1]
+        return lon, lat
+
+    lon, lat = _base_angles(False, size)
+    pi32 = np.float32(math.pi)
+    if face == 'b':
+        lon = np.where(lon >= 0, lon - pi32, lon + pi32)
+    elif face == 'r':
+        lon = lon + pi32 / 2
+    elif face == 'l':
+        lon = lon - pi32 / 2
+    return lon, lat
+
+
+def _source_coords(face: str, size: int, W: int, H: int) -> tuple[np.ndarray, np.ndarray]:
+    """Float32 source-pixel coordinates (px, py) for every pixel of a face."""
+    lon, lat = _face_angles(face, size)
 
     # Map to source-image pixel coordinates
     pi32 = np.float32(math.pi)
     px = (lon / pi32 + np.float32(1.0)) * np.float32(0.5) * np.float32(W - 1)
     py = (np.float32(0.5) - lat / pi32) * np.float32(H - 1)
-    del lon, lat
+    return px, py
+
+
+# Serialises GPU projection across the face workers of every image in
+# flight: each launch holds a full copy of the panorama on the device.  Handed
+# to the workers by the pool initializer (_set_gpu_lock).
+_gpu_lock = None
+
+
+def _set_gpu_lock(lock) -> None:
+    """Pool initializer: install the lock shared by all projecting workers."""
+    global _gpu_lock
+    _gpu_lock = lock
+
+
+@functools.cache
+def _gpu_available() -> bool:
+    """
+    True if CuPy sees a CUDA device.  Checked lazily, in whichever process
+    projects: initialising CUDA in the main process would leave the forked
+    face workers unable to use it.
+    """
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:   # no driver / no device
+        return False
+
+
+def _equirect_to_face_gpu(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """
+    CUDA projection (CuPy): uploads the padded source, runs one thread per
+    output pixel and frees the device memory again before returning.  The
+    face workers take turns (_gpu_lock), so only one copy is on the device.
+    """
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+    d_src = d_out = None
+    with _gpu_lock if _gpu_lock is not None else contextlib.nullcontext():
+        try:
+            d_src = cp.asarray(src)
+            d_out = cp.empty((size, size, 3), dtype=cp.uint8)
+            grid = ((size + 15) // 16, (size + 15) // 16)
+            _project_face_cuda(grid, (16, 16), (d_src, np.int32(H), np.int32(W),
+                                                np.int32(FACE_IDS[face]), d_out, np.int32(size)))
+            return cp.asnumpy(d_out)
+        finally:
+            del d_src, d_out
+            cp.get_default_memory_pool().free_all_blocks()
+
+
+def _equirect_to_face_cv2(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """
+    cv2.remap projection: OpenCV's SIMD bilinear sampler on the px/py maps.
+    Maps are shifted by the one-pixel border of the padded source, which
+    supplies the horizontal wrap and the vertical clamp.
+    """
+    px, py = _source_coords(face, size, src.shape[1] - 2, src.shape[0] - 2)
+    px += np.float32(1.0)
+    py += np.float32(1.0)
+    return cv2.remap(src, px, py, interpolation=cv2.INTER_LINEAR,
+                     borderMode=cv2.BORDER_REPLICATE)
+
+
+def _equirect_to_face_np(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """Vectorised NumPy projection (fallback when neither Numba nor OpenCV is installed)."""
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+
+    px, py = _source_coords(face, size, W, H)
 
     # Bilinear interpolation ─────────────────────────────────────────────────
     x0 = np.floor(px).astype(np.int32)
     y0 = np.floor(py).astype(np.int32)
-    wx = (px - x0.astype(np.float32))   # horizontal fractional weight
-    wy = (py - y0.astype(np.float32))   # vertical fractional weight
+    # Fractional weights as Q0.8 fixed point (0‥256), blended in uint16 below
+    wx = ((px - x0.astype(np.float32)) * 256 + 0.5).astype(np.uint16)   # horizontal
+    wy = ((py - y0.astype(np.float32)) * 256 + 0.5).astype(np.uint16)   # vertical
     del px, py
 
-    # Wrap x (equirectangular is horizontally periodic); clamp y
-    x1 = (x0 + 1) % W
-    y1 = np.clip(y0 + 1, 0, H - 1)
-    x0 = x0 % W
-    y0 = np.clip(y0, 0, H - 1)
-
-    # Sample four neighbours (fancy indexing → copies, float32 for arithmetic)
-    c00 = img_np[y0, x0].astype(np.float32)
-    c10 = img_np[y0, x1].astype(np.float32)
-    c01 = img_np[y1, x0].astype(np.float32)
-    c11 = img_np[y1, x1].astype(np.float32)
-    del x0, x1, y0, y1
+    # Sample four neighbours via flat pixel indices: np.take on the (H·W, 3)
+    # view is ~2× faster than 2-D fancy indexing.  The padded source's border
+    # supplies the horizontal wrap and vertical clamp, so the neighbours are
+    # plain +1 / +row offsets from the top-left index.
+    Wp = W + 2
+    if src.shape[0] * Wp >= 2**31:
+        y0 = y0.astype(np.int64)
+    flat = src.reshape(-1, 3)
+    i00 = y0 * Wp
+    i00 += x0
+    i00 += Wp + 1
+    del x0, y0
+    c00 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 += 1
+    c10 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 += Wp
+    c11 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 -= 1
+    c01 = np.take(flat, i00, axis=0).astype(np.uint16)
+    del i00, flat
 
     # Expand weights to broadcast over RGB channels
     wx = wx[:, :, np.newaxis]
     wy = wy[:, :, np.newaxis]
-    iwx = np.float32(1.0) - wx
-    iwy = np.float32(1.0) - wy
+    iwx = np.uint16(256) - wx
+    iwy = np.uint16(256) - wy
+
+    # Separable blend: each pass is ≤ 255·256 + 128, so uint16 never overflows.
+    # Computed in place in the gathered neighbour arrays (top row lands in
+    # c00, bottom row in c01); the last shift writes the uint8 face directly,
+    # so no uint16 result is allocated just to be cast down.
+    c00 *= iwx
+    c10 *= wx
+    c00 += c10
+    c00 += 128
+    c00 >>= 8
+    c01 *= iwx
+    c11 *= wx
+    c01 += c11
+    c01 += 128
+    c01 >>= 8
+    del c10, c11, wx, iwx
+    c00 *= iwy
+    c01 *= wy
+    c00 += c01
+    del c01, wy, iwy
+
+    out = np.empty((size, size, 3), dtype=np.uint8)
+    np.right_shift(c00, 8, out=out, casting='unsafe')
+    return out
 
-    result = c00 * iwx * iwy + c10 * wx * iwy + c01 * iwx * wy + c11 * wx * wy
-    del c00, c10, c01, c11, wx, wy, iwx, iwy
 
-    return Image.fromarray(result.astype(np.uint8))
+# ── Tile saving ───────────────────────────────────────────────────────────────
 
+_tls = threading.local()   # per-thread JPEG bounce buffer
 
-# ── Tile saving ───────────────────────────────────────────────────────────────
 
-def save_tiles(face_img: Image.Image, face: str, level_idx: int,
-               level_size: int, out_dir: str) -> None:
-    """Resize face_img to level_size and write JPEG tiles (512×512 or smaller at edges)."""
-    if face_img.width != level_size:
-        resized = face_img.resize((level_size, level_size), Image.LANCZOS)
-    else:
-        resized = face_img
+def _encode_tile(tile: np.ndarray) -> memoryview:
+    """
+    Encode one RGB tile as JPEG — libjpeg-turbo's SIMD encoder if available.
 
-    n_full = level_size // TILE_SIZE
-    n_total = n_full + (1 if level_size % TILE_SIZE else 0)
-    for row in range(n_total):
-        row_dir = os.path.join(out_dir, face, f"l{level_idx}", f"{row + 1:02d}")
-        os.makedirs(row_dir, exist_ok=True)
-        y0 = row * TILE_SIZE
-        y1 = min(y0 + TILE_SIZE, level_size)
-        for col in range(n_total):
-            x0 = col * TILE_SIZE
-            x1 = min(x0 + TILE_SIZE, level_size)
-            tile = resized.crop((x0, y0, x1, y1))
-            fname = f"l{level_idx}_{face}_{row + 1:02d}_{col + 1:02d}.jpg"
-            tile.save(os.path.join(row_dir, fname), "JPEG", quality=JPEG_QUALITY)
+    libjpeg-turbo compresses straight into a per-thread buffer sized for a
+    full tile (no per-tile malloc or bytes copy); Pillow encodes to memory so
+    the file still gets a single write.
+    """
+    if _tj is not None:
+        buf = getattr(_tls, 'jpeg_buf', None)
+        if buf is None:
+            full = np.broadcast_to(np.uint8(0), (TILE_SIZE, TILE_SIZE, 3))
+            buf = _tls.jpeg_buf = bytearray(_tj.buffer_size(full, TJSAMP_420))
+        _, n = _tj.encode(tile, quality=JPEG_QUALITY, pixel_format=TJPF_RGB,
+                          jpeg_subsample=TJSAMP_420,   # 4:2:0, as Pillow uses
+                          dst=buf)
+        return memoryview(buf)[:n]
+    out = io.BytesIO()
+    Image.fromarray(tile).save(out, "JPEG", quality=JPEG_QUALITY)
+    return out.getbuffer()
+
+
+def _write_tile_row(tiles: list[np.ndarray], paths: list[str]) -> None:
+    """Encode and write one row of tiles, each with a single write() call."""
+    for tile, path in zip(tiles, paths):
+        data = _encode_tile(tile)
+        # Buffered: BufferedWriter.write() loops until every byte is written,
+        # a raw FileIO.write() may stop short
+        with open(path, 'wb') as fh:
+            fh.write(data)
+
+
+def _downsample(face_np: np.ndarray, size: int) -> np.ndarray:
+    """
+    Lanczos-resize a square (N, N, 3) uint8 face to (size, size, 3).
+
+    reducing_gap lets Pillow box-reduce by an integer factor first whenever
+    the ratio is ≥ 2 × LANCZOS_REDUCING_GAP, so the Lanczos pass only covers
+    the remaining ≤ 3× step.
+    """
+    return np.asarray(Image.fromarray(face_np).resize(
+        (size, size), Image.LANCZOS, reducing_gap=LANCZOS_REDUCING_GAP))
+
+
+def save_tiles(face_np: np.ndarray, face: str, level_idx: int, out_dir: str,
+               jobs: int = 1) -> None:
+    """Write one pyramid level as JPEG tiles (512×512 or smaller at edges).
+
+    Tiles are plain slices of face_np, so no per-tile or per-level PIL image
+    is created.  The row directories must already exist (make_tile_dirs).
+    jobs is the number of images processed in parallel (--jobs); the cores
+    are split between every face worker of every image.
+    """
+    level_size = face_np.shape[0]
+    n_total = tiles_per_side(level_size)
+    edges = [(i * TILE_SIZE, min((i + 1) * TILE_SIZE, level_size)) for i in range(n_total)]
+
+    level_dir = os.path.join(out_dir, face, f"l{level_idx}")
+    row_dirs = [os.path.join(level_dir, f"{row + 1:02d}") for row in range(n_total)]
+
+    # libjpeg releases the GIL while encoding, so rows encode in parallel
+    threads = max(1, (os.cpu_count() or 1) // (len(FACES) * jobs))
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = []
+        for row, (y0, y1) in enumerate(edges):
+            tiles = [face_np[y0:y1, x0:x1] for x0, x1 in edges]
+            paths = [os.path.join(row_dirs[row],
+                                  f"l{level_idx}_{face}_{row + 1:02d}_{col + 1:02d}.jpg")
+                     for col in range(n_total)]
+            futures.append(pool.submit(_write_tile_row, tiles, paths))
+        for fut in futures:
+            fut.result()   # re-raise any write error
 
 
 # ── GPS extraction ────────────────────────────────────────────────────────────
@@ -259,80 +717,185 @@ def get_gps_coordinates(image_path: str) -> tuple[str, str, str]:
 
     # ── Warning if still empty ─────────────────────────────────────────────
     if not lat_str or not lng_str:
-        print(f"Warning: No GPS data found for {os.path.basename(image_path)}",
-              file=sys.stderr)
+        # One write(), so the line stays whole under --jobs
+        sys.stderr.write(f"Warning: No GPS data found for {os.path.basename(image_path)}\n")
 
     return lat_str, lng_str, alt_str
 
 
+# ── Per-face worker ──────────────────────────────────────────────────────────
+
+def _decode_into(img: Image.Image, src: np.ndarray) -> None:
+    """
+    Decode *img* into the interior of the padded (H+2, W+2, 3) source *src*.
+
+    JPEGs go through libjpeg-turbo when available: it decodes straight into
+    the start of *src* (rows packed), then the rows are spread out to the
+    padded layout in place, so *src* is the only full-size buffer.  Anything
+    else — or a JPEG libjpeg-turbo rejects, e.g. CMYK — is decoded by Pillow
+    and copied in horizontal strips, so apart from Pillow's own decode buffer
+    no full-size temporary is created (np.asarray(img) would add one, and
+    convert('RGB') on an RGB image another).
+    """
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+
+    if _tj is not None and img.format == 'JPEG':
+        with open(img.filename, 'rb') as fh:
+            data = fh.read()
+        packed = np.ndarray((H, W, 3), dtype=np.uint8, buffer=src)
+        try:
+            _tj.decode(data, pixel_format=TJPF_RGB, dst=packed)
+        except Exception:
+            pass
+        else:
+            # Bottom row first: row y's padded position starts past the end
+            # of packed rows 0‥y, so no row is overwritten before it moves
+            for y in range(H - 1, -1, -1):
+                src[y + 1, 1:-1] = packed[y]
+            return
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    out = src[1:-1, 1:-1]
+    for y in range(0, H, DECODE_STRIP_ROWS):
+        y1 = min(y + DECODE_STRIP_ROWS, H)
+        out[y:y1] = np.asarray(img.crop((0, y, W, y1)))
+
+
+def _process_face(shm_name: str, shape: tuple[int, int, int], face: str,
+                  level_sizes: tuple[int, ...], out_dir: str, jobs: int = 1) -> bytes:
+    """
+    Project one face, write the tiles for every level and return the face's
+    PREVIEW_FACE_SIZE × PREVIEW_FACE_SIZE thumbnail as raw RGB bytes.
+
+    Runs in a worker process.  The source panorama is attached from shared
+    memory by name instead of being pickled, so all workers share one copy.
+    """
+    if HAVE_NUMBA:
+        # Sibling face workers (of every image running in parallel, see
+        # --jobs) run concurrently; split the cores between them
+        set_num_threads(max(1, get_num_threads() // (len(FACES) * jobs)))
+
+    max_size = level_sizes[-1]
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        src = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        face_np = _face_array(src, face, max_size)
+        del src
+    finally:
+        shm.close()
+
+    # Walk the pyramid largest → smallest, resizing each level from the
+    # previous one instead of from the full-size face every time.  Levels
+    # stay NumPy arrays; tiles are sliced straight out of them.
+    current = face_np
+    for li in range(len(level_sizes), 0, -1):
+        size = level_sizes[li - 1]
+        if current.shape[0] != size:
+            current = _downsample(current, size)
+        save_tiles(current, face, li, out_dir, jobs)
+    del face_np
+
+    # 256×256 thumbnail for preview.jpg, from the smallest level rather than
+    # another Lanczos pass over the full-size face
+    return _downsample(current, PREVIEW_FACE_SIZE).tobytes()
+
+
 # ── Main processing ───────────────────────────────────────────────────────────
 
-def process_image(img_path: str) -> bool:
+def process_image(img_path: str, jobs: int = 1) -> bool:
     img_path = os.path.abspath(img_path)
     stem = os.path.splitext(os.path.basename(img_path))[0]
     out_dir = os.path.join(os.path.dirname(img_path), f"{stem}.tiles")
 
-    print(f"\nProcessing: {img_path}", file=sys.stderr)
-    print(f"Output:     {out_dir}", file=sys.stderr)
+    # Under --jobs several workers share the terminal: every line carries
+    # the image's name and is written whole, never left half-finished.
+    tag = f"[{stem}] " if jobs > 1 else ""
+
+    def log(msg: str) -> None:
+        sys.stderr.write(f"{msg}\n")       # one write(), so lines never split
 
-    # ── Load source ────────────────────────────────────────────────────────
-    img = Image.open(img_path).convert('RGB')
+    def say(msg: str) -> None:
+        log(f"  {tag}{msg}")
+
+    def step(msg: str) -> None:
+        if jobs > 1:
+            say(f"{msg} …")
+        else:
+            print(f"  {msg} … ", end='', flush=True, file=sys.stderr)
+
+    def done() -> None:
+        if jobs == 1:
+            print("done", file=sys.stderr)
+
+    log(f"\nProcessing: {img_path}")
+    log(f"{tag}Output:     {out_dir}")
+
+    # ── Open source (pixels are decoded later, straight into shared memory) ─
+    img = Image.open(img_path)
     W, H = img.size
-    print(f"Source:     {W} × {H} px", file=sys.stderr)
+    log(f"{tag}Source:     {W} × {H} px")
 
     # ── Compute levels ─────────────────────────────────────────────────────
     level_sizes = compute_level_sizes(W)
     if not level_sizes:
-        print("ERROR: image is too small to generate tiles "
-              "(need equirectangular width ≥ ~2011 px).", file=sys.stderr)
+        img.close()
+        log(f"ERROR: {tag}image is too small to generate tiles "
+            "(need equirectangular width ≥ ~2011 px).")
         return False
 
     max_size = level_sizes[-1]
-    print(f"Cube face:  {W / math.pi:.0f} px  →  max level {max_size} px", file=sys.stderr)
-    print(f"Levels:     {level_sizes}", file=sys.stderr)
-
-    os.makedirs(out_dir, exist_ok=True)
-
-    # ── Convert PIL image to numpy (keep a single copy in memory) ──────────
-    img_np = np.array(img)
-    img.close()
-    del img
+    log(f"{tag}Cube face:  {W / math.pi:.0f} px  →  max level {max_size} px")
+    log(f"{tag}Levels:     {list(level_sizes)}")
 
-    # ── Per-face processing ────────────────────────────────────────────────
-    preview_thumbs: dict[str, Image.Image] = {}  # 256×256 per face for preview
-
-    for face in FACES:
-        print(f"  [{face}] projecting at {max_size} px … ", end='', flush=True, file=sys.stderr)
-        face_img = equirect_to_face(img_np, face, max_size)
-        print("done", file=sys.stderr)
+    make_tile_dirs(out_dir, level_sizes)
 
+    # ── Decode the source into shared memory (one copy for all workers) ───
+    # Padded by one pixel on every side for the samplers (see _fill_border)
+    shape = (H + 2, W + 2, 3)
+    shm = shared_memory.SharedMemory(create=True, size=math.prod(shape))
+    try:
+        src = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        _decode_into(img, src)
+        _fill_border(src)
+        img.close()
+        del img, src
+
+        # ── Per-face processing (one worker process per face) ──────────────
+        # The NumPy projection needs GBs of temporaries per face, so without
+        # numba the faces still run one at a time.
+        workers = len(FACES) if HAVE_NUMBA else 1
         for li, size in enumerate(level_sizes, start=1):
-            n_full = size // TILE_SIZE
-            n_total = n_full + (1 if size % TILE_SIZE else 0)
-            print(f"  [{face}] l{li} ({size} px, {n_total}×{n_total} tiles) … ", end='', flush=True, file=sys.stderr)
-            save_tiles(face_img, face, li, size, out_dir)
-            print("done", file=sys.stderr)
-
-        # Keep a 256×256 thumbnail for preview.jpg
-        preview_thumbs[face] = face_img.resize(
-            (PREVIEW_FACE_SIZE, PREVIEW_FACE_SIZE), Image.LANCZOS)
-        del face_img
-
-    del img_np
+            n_total = tiles_per_side(size)
+            say(f"l{li}: {size} px, {n_total}×{n_total} tiles per face")
+
+        preview_thumbs: dict[str, Image.Image] = {}  # 256×256 per face for preview
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_gpu_lock,
+                                 initargs=(_gpu_lock or multiprocessing.Lock(),)) as pool:
+            futures = {face: pool.submit(_process_face, shm.name, shape,
+                                         face, level_sizes, out_dir, jobs)
+                       for face in FACES}
+            for face, fut in futures.items():
+                preview_thumbs[face] = Image.frombytes(
+                    'RGB', (PREVIEW_FACE_SIZE, PREVIEW_FACE_SIZE), fut.result())
+                say(f"[{face}] projected and tiled")
+    finally:
+        shm.close()
+        shm.unlink()
 
     # ── preview.jpg: 256×1536 vertical strip, order l f r b u d ───────────
-    print("  Generating preview.jpg … ", end='', flush=True, file=sys.stderr)
+    step("Generating preview.jpg")
     preview = Image.new('RGB', (PREVIEW_FACE_SIZE, PREVIEW_FACE_SIZE * 6))
     for i, face in enumerate(PREVIEW_FACE_ORDER):
         preview.paste(preview_thumbs[face], (0, i * PREVIEW_FACE_SIZE))
     preview.save(os.path.join(out_dir, 'preview.jpg'), 'JPEG', quality=JPEG_QUALITY)
-    print("done", file=sys.stderr)
+    done()
 
     # ── thumb.jpg: 240×240, front face ─────────────────────────────────────
-    print("  Generating thumb.jpg … ", end='', flush=True, file=sys.stderr)
+    step("Generating thumb.jpg")
     thumb = preview_thumbs['f'].resize((240, 240), Image.LANCZOS)
     thumb.save(os.path.join(out_dir, 'thumb.jpg'), 'JPEG', quality=JPEG_QUALITY)
-    print("done", file=sys.stderr)
+    done()
 
     del preview_thumbs
 
@@ -342,23 +905,39 @@ def process_image(img_path: str) -> bool:
     # ── XML snippet ─────────────────────────────────────────────────────────
     multires = f"512,{','.join(str(s) for s in level_sizes)}"
     scene_name = f"scene_{stem.lower().replace(' ', '_').replace('-', '_')}"
-    print("--- XML snippet (paste into tour.xml) ---", file=sys.stderr)
-    print(f'<scene name="{scene_name}" title="{stem}" onstart="" thumburl="panos/{stem}.tiles/thumb.jpg" lat="{lat}" lng="{lng}" alt="{alt}" heading="0.0">')
-    print(f'\t<control bouncinglimits="calc:image.cube ? true : false" />')
-    print(f'\t<view hlookat="0.0" vlookat="0.0" fovtype="MFOV" fov="120" maxpixelzoom="2.0" fovmin="70" fovmax="140" limitview="auto" />')
-    print(f'\t<preview url="panos/{stem}.tiles/preview.jpg" />')
-    print(f'\t<image>')
-    print(f'\t\t<cube url="panos/{stem}.tiles/%s/l%l/%0v/l%l_%s_%0v_%0h.jpg" multires="{multires}" />')
-    print(f'\t</image>')
-    print(f'</scene>')
-    print("-----------------------------------------", file=sys.stderr)
-
-    print(f"Done → {out_dir}\n", file=sys.stderr)
+    # Written to stdout in one piece, so snippets of images processed in
+    # parallel (--jobs) never interleave
+    xml = '\n'.join([
+        f'<scene name="{scene_name}" title="{stem}" onstart="" thumburl="panos/{stem}.tiles/thumb.jpg" lat="{lat}" lng="{lng}" alt="{alt}" heading="0.0">',
+        f'\t<control bouncinglimits="calc:image.cube ? true : false" />',
+        f'\t<view hlookat="0.0" vlookat="0.0" fovtype="MFOV" fov="120" maxpixelzoom="2.0" fovmin="70" fovmax="140" limitview="auto" />',
+        f'\t<preview url="panos/{stem}.tiles/preview.jpg" />',
+        f'\t<image>',
+        f'\t\t<cube url="panos/{stem}.tiles/%s/l%l/%0v/l%l_%s_%0v_%0h.jpg" multires="{multires}" />',
+        f'\t</image>',
+        f'</scene>',
+    ])
+    log(f"{tag}--- XML snippet (paste into tour.xml) ---")
+    print(xml, flush=True)
+    log(f"{tag}-----------------------------------------")
+
+    log(f"{tag}Done → {out_dir}\n")
     return True
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
+def _run_one(path: str, jobs: int = 1) -> bool:
+    """process_image with errors reported instead of raised (runs in --jobs workers)."""
+    try:
+        return process_image(path, jobs)
+    except Exception as exc:
+        print(f"ERROR processing {path}: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog='tilecreator.py',
@@ -366,26 +945,41 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=(
             'Output: {stem}.tiles/ directory next to each input image.\n'
-            'Large panoramas (≥ 25 MP) may require 8–12 GB of free RAM.'
+            'Large panoramas (≥ 25 MP) may require 8–12 GB of free RAM per image;\n'
+            '--jobs N needs about N times that.'
         ),
     )
     parser.add_argument('images', nargs='+', help='Path(s) to equirectangular JPEG/TIFF')
+    # Without numba every image needs GBs of NumPy temporaries, so by default
+    # only one runs at a time
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=max(1, (os.cpu_count() or 1) // len(FACES)) if HAVE_NUMBA else 1,
+                        help='images to process in parallel (default: one per %d cores '
+                             'with numba, else 1)' % len(FACES))
     args = parser.parse_args()
 
+    if HAVE_NUMBA:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(_compile_kernel).result()
+
     failed = 0
+    paths = []
     for path in args.images:
         if not os.path.isfile(path):
             print(f"ERROR: file not found: {path}", file=sys.stderr)
             failed += 1
-            continue
-        try:
-            if not process_image(path):
-                failed += 1
-        except Exception as exc:
-            print(f"ERROR processing {path}: {exc}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-            failed += 1
+        else:
+            paths.append(path)
+
+    jobs = max(1, min(args.jobs, len(paths)))
+    if jobs > 1:
+        # Each image still fans out into its own face workers
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_set_gpu_lock,
+                                 initargs=(multiprocessing.Lock(),)) as pool:
+            results = list(pool.map(_run_one, paths, [jobs] * len(paths)))
+    else:
+        results = [_run_one(path) for path in paths]
+    failed += results.count(False)
 
     sys.exit(1 if failed else 0)
 
@@ -13,34 +13,232 @@ For each input image the script produces six lossless TIFF files:
 Output files are written next to the input image.
 
 Usage:
-    python3 tocubemap.py <panorama.jpg> [<panorama2.jpg> ...]
+    python3 tocubemap.py [-j N] <panorama.jpg> [<panorama2.jpg> ...]
 
 Dependencies: Pillow, numpy
+Optional:     numba (fused multi-threaded projection kernel)
+              opencv-python (cv2.remap projection when numba is absent)
+              cupy (CUDA projection on an NVIDIA GPU)
+              PyTurboJPEG + libturbojpeg (faster JPEG decoding)
 
 Memory note: each face is generated independently to limit peak RAM.
-A 25 MP panorama (25 000 × 12 500) produces ~8 GB of intermediate arrays
-per face at maximum quality — close to what tilecreator.py requires.
+Without numba, a 25 MP panorama (25 000 × 12 500) produces ~8 GB of
+intermediate arrays per face at maximum quality — close to what
+tilecreator.py requires.  The numba kernel writes the face directly and
+needs no intermediates.
 """
 
 import sys
 import math
 import os
 import argparse
+import contextlib
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 import numpy as np
 from PIL import Image
 
+try:
+    from numba import get_num_threads, njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # optional — fall back to the vectorised NumPy projection
+    HAVE_NUMBA = False
+
+try:
+    import cv2
+    HAVE_CV2 = True
+except ImportError:  # optional — OpenCV's remap is used when numba is absent
+    HAVE_CV2 = False
+
+try:
+    import cupy as cp
+    HAVE_CUPY = True
+except ImportError:  # optional — CUDA projection when a GPU is present
+    HAVE_CUPY = False
+
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    _tj = TurboJPEG()
+except Exception:  # optional — PyTurboJPEG or libturbojpeg missing, Pillow decodes
+    _tj = None
+
 Image.MAX_IMAGE_PIXELS = None   # allow very large panoramas
 
 FACES = ['f', 'b', 'r', 'l', 'u', 'd']
+FACE_IDS = {face: i for i, face in enumerate(FACES)}
+KERNEL_BLOCK = 64         # px; output block edge in the JIT kernel
+CV2_MAX_SOURCE = 32767    # cv2.remap keeps source coords in int16
+DECODE_STRIP_ROWS = 256   # rows per strip when decoding the source
 
 
 # ── Projection ────────────────────────────────────────────────────────────────
 
+# float32 minimax coefficients: atan(a) on [0, 1] (|err| < 2e-6 rad) and
+# Abramowitz & Stegun 4.4.46 for asin (|err| < 2e-8 rad).  Tuples, so numba
+# folds them in as compile-time constants.
+_ATAN_COEFFS = (np.float32(0.99997726), np.float32(-0.33262347), np.float32(0.19354346),
+                np.float32(-0.11643287), np.float32(0.05265332), np.float32(-0.01172120))
+_ASIN_COEFFS = (np.float32(1.5707963050), np.float32(-0.2145988016), np.float32(0.0889789874),
+                np.float32(-0.0501743046), np.float32(0.0308918810), np.float32(-0.0170881256),
+                np.float32(0.0066700901), np.float32(-0.0012624911))
+
+
+if HAVE_NUMBA:
+    @njit(fastmath=True, cache=True)
+    def _atan2_f32(y, x):
+        """Polynomial float32 atan2 — a few FMAs instead of a libm call."""
+        c = _ATAN_COEFFS
+        ax = abs(x)
+        ay = abs(y)
+        a = min(ax, ay) / max(ax, ay, np.float32(1e-30))
+        s = a * a
+        r = a * (c[0] + s * (c[1] + s * (c[2] + s * (c[3] + s * (c[4] + s * c[5])))))
+        if ay > ax:
+            r = np.float32(math.pi / 2) - r
+        if x < 0:
+            r = np.float32(math.pi) - r
+        return math.copysign(r, y)
+
+    @njit(fastmath=True, cache=True)
+    def _asin_f32(v):
+        """Polynomial float32 arcsin for v ∈ [-1, 1]."""
+        c = _ASIN_COEFFS
+        a = abs(v)
+        p = c[0] + a * (c[1] + a * (c[2] + a * (c[3] + a * (c[4] + a * (c[5] + a * (c[6] + a * c[7]))))))
+        return math.copysign(np.float32(math.pi / 2) - math.sqrt(np.float32(1.0) - a) * p, v)
+
+    @njit(parallel=True, fastmath=True, cache=True, boundscheck=False)
+    def _project_face(img, face_id, out):
+        """
+        Fused per-pixel projection kernel: direction → lon/lat → bilinear sample.
+
+        Same maths as the NumPy path below, but every intermediate lives in
+        registers, so the only array written is the (size, size, 3) uint8 output.
+        img is the padded source (see _fill_border).
+        """
+        H, W = img.shape[0] - 2, img.shape[1] - 2
+        size = out.shape[0]
+        step = np.float32(2.0) / np.float32(max(size - 1, 1))
+        inv_pi = np.float32(1.0 / math.pi)
+        half_w = np.float32(0.5) * np.float32(W - 1)
+        h1 = np.float32(H - 1)
+        one = np.float32(1.0)
+
+        # 64×64 output blocks: neighbouring output pixels sample neighbouring
+        # source pixels, so a block's source footprint stays cache-resident
+        nb = (size + KERNEL_BLOCK - 1) // KERNEL_BLOCK
+        for b in prange(nb * nb):
+            bj = (b // nb) * KERNEL_BLOCK
+            bi = (b % nb) * KERNEL_BLOCK
+            for j in range(bj, min(bj + KERNEL_BLOCK, size)):
+                v = one - np.float32(j) * step
+                for i in range(bi, min(bi + KERNEL_BLOCK, size)):
+                    u = np.float32(i) * step - one
+
+                    # Direction vector (same table as the NumPy path)
+                    if face_id == 0:      # f
+                        dx, dy, dz = u, v, one
+                    elif face_id == 1:    # b
+                        dx, dy, dz = -u, v, -one
+                    elif face_id == 2:    # r
+                        dx, dy, dz = one, v, -u
+                    elif face_id == 3:    # l
+                        dx, dy, dz = -one, v, u
+                    elif face_id == 4:    # u
+                        dx, dy, dz = u, one, -v
+                    else:                 # d
+                        dx, dy, dz = u, -one, v
+
+                    # atan2 is scale-invariant, so only dy needs normalising
+                    lon = _atan2_f32(dx, dz)
+                    lat = _asin_f32(min(max(dy / math.sqrt(dx * dx + dy * dy + dz * dz), -one), one))
+
+                    px = (lon * inv_pi + one) * half_w
+                    py = (np.float32(0.5) - lat * inv_pi) * h1
+
+                    fx = math.floor(px)
+                    fy = math.floor(py)
+                    # Q0.8 fixed-point weights (0‥256)
+                    wx = int((px - fx) * np.float32(256.0) + np.float32(0.5))
+                    wy = int((py - fy) * np.float32(256.0) + np.float32(0.5))
+                    iwx = 256 - wx
+                    iwy = 256 - wy
+
+                    # +1 for the border: no wrap or clamp needed
+                    x0 = int(fx) + 1
+                    y0 = int(fy) + 1
+                    x1 = x0 + 1
+                    y1 = y0 + 1
+
+                    # Separable integer blend, identical to the NumPy path
+                    for c in range(3):
+                        top = (img[y0, x0, c] * iwx + img[y0, x1, c] * wx + 128) >> 8
+                        bot = (img[y1, x0, c] * iwx + img[y1, x1, c] * wx + 128) >> 8
+                        out[j, i, c] = (top * iwy + bot * wy) >> 8
+
+
+# CUDA port of _project_face for CuPy: one thread per output pixel, same
+# direction table, padded-source indexing and Q0.8 separable blend.
+_CUDA_SRC = r"""
+extern "C" __global__
+void project_face(const unsigned char* src, int H, int W, int face_id,
+                  unsigned char* out, int size)
+{
+    int i = blockIdx.x * blockDim.x + threadIdx.x;
+    int j = blockIdx.y * blockDim.y + threadIdx.y;
+    if (i >= size || j >= size) return;
+
+    float step = 2.0f / (float)max(size - 1, 1);
+    float u = i * step - 1.0f;
+    float v = 1.0f - j * step;
+    float dx, dy, dz;
+    switch (face_id) {
+        case 0:  dx = u;     dy = v;     dz = 1.0f;  break;   // f
+        case 1:  dx = -u;    dy = v;     dz = -1.0f; break;   // b
+        case 2:  dx = 1.0f;  dy = v;     dz = -u;    break;   // r
+        case 3:  dx = -1.0f; dy = v;     dz = u;     break;   // l
+        case 4:  dx = u;     dy = 1.0f;  dz = -v;    break;   // u
+        default: dx = u;     dy = -1.0f; dz = v;     break;   // d
+    }
+
+    const float inv_pi = 0.318309886f;
+    float lon = atan2f(dx, dz);
+    float lat = asinf(fminf(fmaxf(dy * rsqrtf(dx * dx + dy * dy + dz * dz), -1.0f), 1.0f));
+    float px = (lon * inv_pi + 1.0f) * 0.5f * (float)(W - 1);
+    float py = (0.5f - lat * inv_pi) * (float)(H - 1);
+
+    float fx = floorf(px);
+    float fy = floorf(py);
+    int wx = (int)((px - fx) * 256.0f + 0.5f);
+    int wy = (int)((py - fy) * 256.0f + 0.5f);
+
+    // +1 for the border: no wrap or clamp needed
+    long long row = 3LL * (W + 2);
+    const unsigned char* p00 = src + ((long long)fy + 1) * row + ((long long)fx + 1) * 3;
+    const unsigned char* p01 = p00 + row;
+    unsigned char* o = out + ((long long)j * size + i) * 3;
+    for (int c = 0; c < 3; ++c) {
+        int top = (p00[c] * (256 - wx) + p00[c + 3] * wx + 128) >> 8;
+        int bot = (p01[c] * (256 - wx) + p01[c + 3] * wx + 128) >> 8;
+        o[c] = (unsigned char)((top * (256 - wy) + bot * wy) >> 8);
+    }
+}
+"""
+
+if HAVE_CUPY:
+    _project_face_cuda = cp.RawKernel(_CUDA_SRC, 'project_face')   # compiled on first launch
+
+
 def equirect_to_face(img_np: np.ndarray, face: str, size: int) -> Image.Image:
     """
     Project an equirectangular image onto one cube face (bilinear interpolation).
 
+    Runs on a CUDA GPU via CuPy when available, else the fused Numba kernel,
+    else OpenCV's remap, else the NumPy fallback.
+
     Coordinate system (right-handed, krpano convention):
         +Z = front   +X = right   +Y = up
 
@@ -52,111 +250,354 @@ def equirect_to_face(img_np: np.ndarray, face: str, size: int) -> Image.Image:
     Returns:
         PIL Image (RGB, size × size)
     """
+    return Image.fromarray(_face_array(_padded(img_np), face, size))
+
+
+def _fill_border(src: np.ndarray) -> None:
+    """
+    Fill the one-pixel border of a padded (H+2, W+2, 3) source in place:
+    left/right columns wrap, top/bottom rows clamp.  The samplers then read
+    neighbours at plain +1 offsets with no modulo or clip passes.
+    """
+    src[1:-1, 0] = src[1:-1, -2]
+    src[1:-1, -1] = src[1:-1, 1]
+    src[0] = src[1]
+    src[-1] = src[-2]
+
+
+def _padded(img_np: np.ndarray) -> np.ndarray:
+    """Copy an (H, W, 3) array into a new padded source."""
     H, W = img_np.shape[:2]
+    src = np.empty((H + 2, W + 2, 3), dtype=np.uint8)
+    src[1:-1, 1:-1] = img_np
+    _fill_border(src)
+    return src
 
-    # UV grids: u ∈ [-1, +1] left→right, v ∈ [+1, -1] top→bottom
-    u = np.linspace(-1.0, 1.0, size, dtype=np.float32)
-    v = np.linspace(1.0, -1.0, size, dtype=np.float32)
-    uu, vv = np.meshgrid(u, v)
-    del u, v
-
-    # 3-D direction vectors per face
-    if face == 'f':    # Front  +Z
-        dx, dy, dz = uu, vv, np.ones((size, size), dtype=np.float32)
-    elif face == 'b':  # Back   -Z
-        dx, dy, dz = -uu, vv, np.full((size, size), -1.0, dtype=np.float32)
-    elif face == 'r':  # Right  +X
-        dx, dy, dz = np.ones((size, size), dtype=np.float32), vv, -uu
-    elif face == 'l':  # Left   -X
-        dx, dy, dz = np.full((size, size), -1.0, dtype=np.float32), vv, uu
-    elif face == 'u':  # Up     +Y
-        dx, dy, dz = uu, np.ones((size, size), dtype=np.float32), -vv
-    elif face == 'd':  # Down   -Y
-        dx, dy, dz = uu, np.full((size, size), -1.0, dtype=np.float32), vv
-    else:
+
+def _face_array(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """equirect_to_face on an already padded source, as a uint8 array."""
+    global HAVE_CUPY
+    if face not in FACE_IDS:
         raise ValueError(f"Unknown face: {face!r}")
 
-    del uu, vv
+    if HAVE_CUPY and _gpu_available():
+        try:
+            return _equirect_to_face_gpu(src, face, size)
+        except Exception as exc:    # NVRTC compile, driver or out-of-memory error
+            print(f"WARNING: GPU projection of face '{face}' failed ({exc}); "
+                  f"using the CPU from now on", file=sys.stderr)
+            HAVE_CUPY = False
+
+    if HAVE_NUMBA:
+        out = np.empty((size, size, 3), dtype=np.uint8)
+        _project_face(src, FACE_IDS[face], out)
+        return out
+
+    if HAVE_CV2 and max(src.shape[:2]) < CV2_MAX_SOURCE:
+        return _equirect_to_face_cv2(src, face, size)
+
+    return _equirect_to_face_np(src, face, size)
 
-    # Normalise
-    norm = np.sqrt(dx * dx + dy * dy + dz * dz)
-    dx /= norm; dy /= norm; dz /= norm
-    del norm
 
-    # Spherical coordinates
-    lon = np.arctan2(dx, dz).astype(np.float32)                  # [-π, π]
-    lat = np.arcsin(np.clip(dy, -1.0, 1.0)).astype(np.float32)   # [-π/2, π/2]
-    del dx, dy, dz
+def _compile_kernel() -> None:
+    """
+    Run the numba kernel once so it lands in the on-disk cache.  main() calls
+    this in a throwaway process (numba's thread pool must not be forked) so
+    the face workers load the kernel instead of each compiling it.
+    """
+    _project_face(np.zeros((4, 4, 3), dtype=np.uint8), 0,
+                  np.empty((1, 1, 3), dtype=np.uint8))
+
+
+@functools.lru_cache(maxsize=2)
+def _base_angles(polar: bool, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read-only lon/lat grids for the front (polar=False) or up (polar=True)
+    face, cached per size and shared between the faces one worker projects.
+    The other faces are derived in _face_angles.
+    Normalisation cancels inside arctan2, so each angle is one ufunc over the
+    broadcast u/v axes; the front face's lon is a broadcast view of one row.
+    """
+    # u ∈ [-1, +1] left→right, v ∈ [+1, -1] top→bottom
+    u = np.linspace(-1.0, 1.0, size, dtype=np.float32)[np.newaxis, :]
+    v = np.linspace(1.0, -1.0, size, dtype=np.float32)[:, np.newaxis]
+
+    if polar:   # Up     +Y
+        lon = np.arctan2(u, -v)                               # [-π, π]
+        lat = np.arctan2(np.float32(1.0), np.hypot(u, v))     # (0, π/2]
+    else:       # Front  +Z
+        lon = np.broadcast_to(np.arctan(u), (size, size))
+        lat = np.arctan2(v, np.sqrt(u * u + np.float32(1.0)))
+
+    lon.setflags(write=False)
+    lat.setflags(write=False)
+    return lon, lat
+
+
+def _face_angles(face: str, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    lon/lat grids for any face: b/r/l are the front face with longitude
+    offset by π/+π/2/-π/2; d is the up face flipped with latitude negated.
+    """
+    if face in ('u', 'd'):
+        lon, lat = _base_angles(True, size)
+        if face == 'd':
+            lon, lat = lon[::-1], -lat[::-1]
+        return lon, lat
+
+    lon, lat = _base_angles(False, size)
+    pi32 = np.float32(math.pi)
+    if face == 'b':
+        lon = np.where(lon >= 0, lon - pi32, lon + pi32)
+    elif face == 'r':
+        lon = lon + pi32 / 2
+    elif face == 'l':
+        lon = lon - pi32 / 2
+    return lon, lat
+
+
+def _source_coords(face: str, size: int, W: int, H: int) -> tuple[np.ndarray, np.ndarray]:
+    """Float32 source-pixel coordinates (px, py) for every pixel of a face."""
+    lon, lat = _face_angles(face, size)
 
     # Source pixel coordinates
     pi32 = np.float32(math.pi)
     px = (lon / pi32 + np.float32(1.0)) * np.float32(0.5) * np.float32(W - 1)
     py = (np.float32(0.5) - lat / pi32) * np.float32(H - 1)
-    del lon, lat
+    return px, py
+
+
+# Serialises GPU projection across the face workers of every image in
+# flight: each launch holds a full copy of the panorama on the device.  Handed
+# to the workers by the pool initializer (_set_gpu_lock).
+_gpu_lock = None
+
+
+def _set_gpu_lock(lock) -> None:
+    """Pool initializer: install the lock shared by all projecting workers."""
+    global _gpu_lock
+    _gpu_lock = lock
+
+
+@functools.cache
+def _gpu_available() -> bool:
+    """
+    True if CuPy sees a CUDA device.  Checked lazily in the projecting
+    process — CUDA initialised in the parent breaks the forked workers.
+    """
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:   # no driver / no device
+        return False
+
+
+def _equirect_to_face_gpu(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """
+    CUDA projection (CuPy); device memory is released before returning.
+    The face workers take turns (_gpu_lock), so only one copy is on the device.
+    """
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+    d_src = d_out = None
+    with _gpu_lock if _gpu_lock is not None else contextlib.nullcontext():
+        try:
+            d_src = cp.asarray(src)
+            d_out = cp.empty((size, size, 3), dtype=cp.uint8)
+            grid = ((size + 15) // 16, (size + 15) // 16)
+            _project_face_cuda(grid, (16, 16), (d_src, np.int32(H), np.int32(W),
+                                                np.int32(FACE_IDS[face]), d_out, np.int32(size)))
+            return cp.asnumpy(d_out)
+        finally:
+            del d_src, d_out
+            cp.get_default_memory_pool().free_all_blocks()
+
+
+def _equirect_to_face_cv2(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """
+    cv2.remap projection: OpenCV's SIMD bilinear sampler on the px/py maps.
+    Maps are shifted by the one-pixel border of the padded source, which
+    supplies the horizontal wrap and the vertical clamp.
+    """
+    px, py = _source_coords(face, size, src.shape[1] - 2, src.shape[0] - 2)
+    px += np.float32(1.0)
+    py += np.float32(1.0)
+    return cv2.remap(src, px, py, interpolation=cv2.INTER_LINEAR,
+                     borderMode=cv2.BORDER_REPLICATE)
+
+
+def _equirect_to_face_np(src: np.ndarray, face: str, size: int) -> np.ndarray:
+    """Vectorised NumPy projection (fallback when neither Numba nor OpenCV is installed)."""
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+
+    px, py = _source_coords(face, size, W, H)
 
     # Bilinear interpolation
     x0 = np.floor(px).astype(np.int32)
     y0 = np.floor(py).astype(np.int32)
-    wx = (px - x0.astype(np.float32))
-    wy = (py - y0.astype(np.float32))
+    wx = ((px - x0.astype(np.float32)) * 256 + 0.5).astype(np.uint16)   # Q0.8
+    wy = ((py - y0.astype(np.float32)) * 256 + 0.5).astype(np.uint16)
     del px, py
 
-    x1 = (x0 + 1) % W          # wrap horizontally
-    y1 = np.clip(y0 + 1, 0, H - 1)
-    x0 = x0 % W
-    y0 = np.clip(y0, 0, H - 1)
-
-    c00 = img_np[y0, x0].astype(np.float32)
-    c10 = img_np[y0, x1].astype(np.float32)
-    c01 = img_np[y1, x0].astype(np.float32)
-    c11 = img_np[y1, x1].astype(np.float32)
-    del x0, x1, y0, y1
-
+    # Flat pixel indices + np.take: ~2× faster than 2-D fancy indexing.
+    # The padded border wraps x and clamps y, so neighbours are plain offsets.
+    Wp = W + 2
+    if src.shape[0] * Wp >= 2**31:
+        y0 = y0.astype(np.int64)
+    flat = src.reshape(-1, 3)
+    i00 = y0 * Wp
+    i00 += x0
+    i00 += Wp + 1
+    del x0, y0
+    c00 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 += 1
+    c10 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 += Wp
+    c11 = np.take(flat, i00, axis=0).astype(np.uint16)
+    i00 -= 1
+    c01 = np.take(flat, i00, axis=0).astype(np.uint16)
+    del i00, flat
+
+    # Separable fixed-point blend (each pass ≤ 255·256 + 128, fits uint16),
+    # in place: top row in c00, bottom row in c01, final shift straight to uint8
     wx = wx[:, :, np.newaxis]
     wy = wy[:, :, np.newaxis]
-    result = (c00 * (1.0 - wx) * (1.0 - wy)
-              + c10 * wx * (1.0 - wy)
-              + c01 * (1.0 - wx) * wy
-              + c11 * wx * wy)
-    del c00, c10, c01, c11, wx, wy
-
-    return Image.fromarray(result.astype(np.uint8))
+    c00 *= 256 - wx
+    c10 *= wx
+    c00 += c10
+    c00 += 128
+    c00 >>= 8
+    c01 *= 256 - wx
+    c11 *= wx
+    c01 += c11
+    c01 += 128
+    c01 >>= 8
+    del c10, c11, wx
+    c00 *= 256 - wy
+    c01 *= wy
+    c00 += c01
+    del c01, wy
+
+    out = np.empty((size, size, 3), dtype=np.uint8)
+    np.right_shift(c00, 8, out=out, casting='unsafe')
+    return out
 
 
 # ── Main processing ───────────────────────────────────────────────────────────
 
-def process_image(img_path: str) -> bool:
+def _decode_into(img: Image.Image, src: np.ndarray) -> None:
+    """
+    Decode *img* into the interior of the padded (H+2, W+2, 3) source *src*.
+
+    JPEGs are decoded by libjpeg-turbo straight into *src* (rows packed) and
+    then spread out to the padded layout in place.  Other formats, or JPEGs
+    it rejects, go through Pillow in horizontal strips, so apart from
+    Pillow's own decode buffer no full-size temporary is created.
+    """
+    H, W = src.shape[0] - 2, src.shape[1] - 2
+
+    if _tj is not None and img.format == 'JPEG':
+        with open(img.filename, 'rb') as fh:
+            data = fh.read()
+        packed = np.ndarray((H, W, 3), dtype=np.uint8, buffer=src)
+        try:
+            _tj.decode(data, pixel_format=TJPF_RGB, dst=packed)
+        except Exception:   # e.g. CMYK — let Pillow convert it
+            pass
+        else:
+            # Bottom row first: a row's padded slot lies past every packed
+            # row not yet moved
+            for y in range(H - 1, -1, -1):
+                src[y + 1, 1:-1] = packed[y]
+            return
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    out = src[1:-1, 1:-1]
+    for y in range(0, H, DECODE_STRIP_ROWS):
+        y1 = min(y + DECODE_STRIP_ROWS, H)
+        out[y:y1] = np.asarray(img.crop((0, y, W, y1)))
+
+
+def _process_face(shm_name: str, shape: tuple[int, int, int], face: str,
+                  face_size: int, out_path: str, jobs: int = 1) -> None:
+    """
+    Worker: project one face from the shared-memory source and save its TIFF.
+    The panorama is attached by name, so it is never pickled or copied.
+    """
+    if HAVE_NUMBA:
+        # Share the cores with the sibling faces of every image in flight
+        set_num_threads(max(1, get_num_threads() // (len(FACES) * jobs)))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        src = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        face_np = _face_array(src, face, face_size)
+        del src
+    finally:
+        shm.close()
+    Image.fromarray(face_np).save(out_path, format='TIFF')
+
+
+def process_image(img_path: str, jobs: int = 1) -> bool:
     img_path = os.path.abspath(img_path)
     stem = os.path.splitext(os.path.basename(img_path))[0]
     out_dir = os.path.dirname(img_path)
 
     print(f"\nProcessing: {img_path}")
 
-    img = Image.open(img_path).convert('RGB')
+    # Under --jobs several workers share the terminal: tag every line with
+    # the image's name and flush it whole.
+    tag = f"[{stem}] " if jobs > 1 else ""
+
+    img = Image.open(img_path)
     W, H = img.size
     face_size = round(W / math.pi)
-    print(f"Source:     {W} × {H} px")
-    print(f"Face size:  {face_size} × {face_size} px")
-
-    img_np = np.array(img)
-    img.close()
-    del img
-
-    for face in FACES:
-        out_path = os.path.join(out_dir, f"{stem}_{face}.tif")
-        print(f"  [{face}] → {os.path.basename(out_path)} … ", end='', flush=True)
-        face_img = equirect_to_face(img_np, face, face_size)
-        face_img.save(out_path, format='TIFF')
-        del face_img
-        print("done")
-
-    del img_np
-    print(f"Done: {stem}_{{f,b,l,r,u,d}}.tif\n")
+    print(f"{tag}Source:     {W} × {H} px", flush=True)
+    print(f"{tag}Face size:  {face_size} × {face_size} px", flush=True)
+
+    # Decode into shared memory once; the face workers attach to it by name.
+    # One pixel of padding on every side (see _fill_border).
+    shape = (H + 2, W + 2, 3)
+    shm = shared_memory.SharedMemory(create=True, size=math.prod(shape))
+    try:
+        src = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        _decode_into(img, src)
+        _fill_border(src)
+        img.close()
+        del img, src
+
+        # Without numba each face needs GBs of temporaries — one at a time
+        workers = len(FACES) if HAVE_NUMBA else 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_gpu_lock,
+                                 initargs=(_gpu_lock or multiprocessing.Lock(),)) as pool:
+            futures = {}
+            for face in FACES:
+                out_path = os.path.join(out_dir, f"{stem}_{face}.tif")
+                futures[face] = pool.submit(_process_face, shm.name, shape,
+                                            face, face_size, out_path, jobs)
+            for face, fut in futures.items():
+                fut.result()
+                print(f"  {tag}[{face}] → {stem}_{face}.tif done", flush=True)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    print(f"{tag}Done: {stem}_{{f,b,l,r,u,d}}.tif\n", flush=True)
     return True
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
+def _run_one(path: str, jobs: int = 1) -> bool:
+    """process_image with errors reported instead of raised (runs in --jobs workers)."""
+    try:
+        return process_image(path, jobs)
+    except Exception as exc:
+        print(f"ERROR processing {path}: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog='tocubemap.py',
@@ -164,22 +605,36 @@ def main() -> None:
         epilog='Output files are written next to each input image.',
     )
     parser.add_argument('images', nargs='+', help='Equirectangular image path(s)')
+    # Without numba every image needs GBs of NumPy temporaries, so by default
+    # only one runs at a time
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=max(1, (os.cpu_count() or 1) // len(FACES)) if HAVE_NUMBA else 1,
+                        help='images to process in parallel (default: one per %d cores '
+                             'with numba, else 1)' % len(FACES))
     args = parser.parse_args()
 
+    if HAVE_NUMBA:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            pool.submit(_compile_kernel).result()
+
     failed = 0
+    paths = []
     for path in args.images:
         if not os.path.isfile(path):
             print(f"ERROR: file not found: {path}", file=sys.stderr)
             failed += 1
-            continue
-        try:
-            if not process_image(path):
-                failed += 1
-        except Exception as exc:
-            print(f"ERROR processing {path}: {exc}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-            failed += 1
+        else:
+            paths.append(path)
+
+    jobs = max(1, min(args.jobs, len(paths)))
+    if jobs > 1:
+        # Each image still fans out into its own face workers
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_set_gpu_lock,
+                                 initargs=(multiprocessing.Lock(),)) as pool:
+            results = list(pool.map(_run_one, paths, [jobs] * len(paths)))
+    else:
+        results = [_run_one(path) for path in paths]
+    failed += results.count(False)
 
     sys.exit(1 if failed else 0)
 
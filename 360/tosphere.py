@@ -18,18 +18,51 @@ Usage:
     python3 tosphere.py IMG_1650_f.tif              # auto-discovers the other 5
     python3 tosphere.py sceneA_f.tif sceneB_f.tif   # two panoramas
     python3 tosphere.py *.tif                        # whole folder
+    python3 tosphere.py -j 2 *.tif                   # two panoramas at a time
 
 Dependencies: Pillow, numpy
+Optional:     numba (fused multi-threaded projection kernel)
+              cupy (CUDA projection on an NVIDIA GPU)
+              tifffile (writes the output TIFF straight from the array)
+              PyTurboJPEG + libturbojpeg (faster JPEG face decoding)
 """
 
 import sys
 import math
 import os
 import argparse
+import contextlib
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
 from PIL import Image
 
+try:
+    from numba import get_num_threads, njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # optional — fall back to the vectorised NumPy projection
+    HAVE_NUMBA = False
+
+try:
+    import cupy as cp
+    HAVE_CUPY = True
+except ImportError:  # optional — CUDA projection when a GPU is present
+    HAVE_CUPY = False
+
+try:
+    import tifffile
+    HAVE_TIFFFILE = True
+except ImportError:  # optional — Pillow writes the output TIFF otherwise
+    HAVE_TIFFFILE = False
+
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    _tj = TurboJPEG()
+except Exception:  # optional — PyTurboJPEG or libturbojpeg missing, Pillow decodes
+    _tj = None
+
 Image.MAX_IMAGE_PIXELS = None
 
 # ── Constants ─────────────────────────────────────────────────────────────────
@@ -44,6 +77,14 @@ SUFFIX_TO_FACE: dict[str, str] = {
 
 EXTENSIONS = ['.tif', '.tiff', '.TIF', '.TIFF', '.jpg', '.jpeg', '.JPG', '.JPEG']
 
+# Output rows per stripe in the NumPy projection; keeps the per-pixel float
+# intermediates (~40 bytes/pixel) at a few MB per stripe, i.e. in cache.
+ROW_STRIPE = 16
+
+# Classic TIFF uses 32-bit offsets; outputs at or above this size (pixel data
+# plus headroom for tags) are written as BigTIFF instead.
+BIGTIFF_THRESHOLD = 2**32 - 2**25
+
 
 # ── Input discovery ───────────────────────────────────────────────────────────
 
@@ -63,18 +104,40 @@ def parse_face_path(path: str) -> tuple[str, str, str] | None:
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def _dir_files(directory: str) -> dict[str, str]:
+    """
+    Map file name → path for the regular files in *directory*, listed once.
+    Every file is also keyed by its lower-cased name, so lookups can stay
+    case-insensitive, as os.path.isfile is on case-insensitive filesystems
+    (macOS, Windows).  A missing or unreadable directory maps to no files,
+    so its panoramas are reported as missing faces and skipped.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [(e.name, e.path) for e in it if e.is_file()]
+    except OSError:
+        return {}
+    files = {name.lower(): path for name, path in reversed(entries)}
+    files.update(entries)           # exact names win over case-folded ones
+    return files
+
+
 def find_all_faces(directory: str, prefix: str) -> dict[str, str]:
     """
     Return a dict mapping face_key → absolute file path for all 6 faces
     found in *directory* with the given *prefix*.  Any supported extension
-    is accepted; the first match per face wins.
+    is accepted, in any case; the first match per face wins.  The directory
+    is listed once per run rather than probed with a stat per candidate name.
     """
+    files = _dir_files(directory)
     found: dict[str, str] = {}
     for suffix, face in SUFFIX_TO_FACE.items():
         for ext in EXTENSIONS:
-            candidate = os.path.join(directory, prefix + suffix + ext)
-            if os.path.isfile(candidate):
-                found[face] = candidate
+            name = prefix + suffix + ext
+            path = files.get(name) or files.get(name.lower())
+            if path is not None:
+                found[face] = path
                 break
     return found
 
@@ -115,16 +178,172 @@ def collect_panoramas(paths: list[str]) -> list[tuple[str, str, dict[str, str]]]
 
 # ── Inverse projection ────────────────────────────────────────────────────────
 
-def faces_to_equirect(face_imgs: dict[str, np.ndarray],
-                      out_w: int, out_h: int) -> np.ndarray:
+# Lookup tables for the NumPy inverse projection.  U_SIGN / V_SIGN are
+# indexed by face id (0=f 1=b 2=r 3=l 4=u 5=d); AXIS_FACE maps the dominant
+# axis (0=x 1=y 2=z) to its positive face, the negative one being +1.
+#                   f   b   r   l   u   d
+U_SIGN = np.array([ 1,  1, -1, -1,  1, -1], dtype=np.float32)
+V_SIGN = np.array([ 1, -1,  1, -1, -1, -1], dtype=np.float32)
+AXIS_FACE = np.array([2, 4, 0], dtype=np.int8)      # x→r/l, y→u/d, z→f/b
+
+if HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True, boundscheck=False)
+    def _project_equirect(faces, sin_lon, cos_lon, out):
+        """
+        Fused per-pixel inverse projection: lon/lat → direction → face + UV →
+        bilinear sample.
+
+        faces is the (6, size, size, 3) stack in FACES order; sin_lon/cos_lon
+        hold the per-column longitude terms.  Each row's latitude terms are
+        computed once, so the inner loop does no trig; every other
+        intermediate lives in registers and only the uint8 output is written.
+        """
+        out_h, out_w = out.shape[0], out.shape[1]
+        size = faces.shape[1]
+        s1 = np.float32(size - 1)
+        half = np.float32(0.5)
+        one = np.float32(1.0)
+        pi = np.float32(math.pi)
+        lat_step = one / np.float32(out_h - 1)
+
+        for j in prange(out_h):
+            lat = (half - np.float32(j) * lat_step) * pi
+            cos_lat = math.cos(lat)
+            dy = math.sin(lat)
+            ady = abs(dy)
+            for i in range(out_w):
+                dx = cos_lat * sin_lon[i]
+                dz = cos_lat * cos_lon[i]
+                adx = abs(dx)
+                adz = abs(dz)
+
+                # Dominant axis picks the face (same rules as the NumPy path)
+                if adx >= ady and adx >= adz:
+                    if dx > 0:      # r
+                        fi, u, v = 2, -dz / dx, dy / dx
+                    else:           # l
+                        fi, u, v = 3, -dz / dx, -dy / dx
+                elif ady >= adz:
+                    if dy > 0:      # u
+                        fi, u, v = 4, dx / dy, -dz / dy
+                    else:           # d
+                        fi, u, v = 5, -dx / dy, -dz / dy
+                elif dz < 0:        # b
+                    fi, u, v = 1, dx / dz, -dy / dz
+                else:               # f
+                    fi, u, v = 0, dx / dz, dy / dz
+
+                px = (u + one) * half * s1
+                py = (one - v) * half * s1
+                fx = math.floor(px)
+                fy = math.floor(py)
+                # Q0.8 fixed-point weights (0‥256)
+                wx = int((px - fx) * np.float32(256.0) + half)
+                wy = int((py - fy) * np.float32(256.0) + half)
+                iwx = 256 - wx
+                iwy = 256 - wy
+
+                # Clamp (cube faces don't wrap)
+                x0 = min(max(int(fx), 0), size - 1)
+                y0 = min(max(int(fy), 0), size - 1)
+                x1 = min(x0 + 1, size - 1)
+                y1 = min(y0 + 1, size - 1)
+
+                face = faces[fi]
+                for c in range(3):
+                    top = (face[y0, x0, c] * iwx + face[y0, x1, c] * wx + 128) >> 8
+                    bot = (face[y1, x0, c] * iwx + face[y1, x1, c] * wx + 128) >> 8
+                    out[j, i, c] = (top * iwy + bot * wy) >> 8
+
+
+def _compile_kernel() -> None:
+    """
+    Run the numba kernel once so it lands in the on-disk cache.  main() calls
+    this in a throwaway process (numba's thread pool must not be forked) so
+    the --jobs workers load the kernel instead of each compiling it.
+    """
+    _project_equirect(np.zeros((len(FACES), 2, 2, 3), dtype=np.uint8),
+                      np.zeros(2, dtype=np.float32), np.ones(2, dtype=np.float32),
+                      np.empty((2, 2, 3), dtype=np.uint8))
+
+
+# CUDA port of _project_equirect for CuPy: one thread per output pixel, same
+# dominant-axis face selection, edge clamping and Q0.8 separable blend.
+_CUDA_SRC = r"""
+extern "C" __global__
+void project_equirect(const unsigned char* faces, int size,
+                      unsigned char* out, int out_w, int out_h)
+{
+    int i = blockIdx.x * blockDim.x + threadIdx.x;
+    int j = blockIdx.y * blockDim.y + threadIdx.y;
+    if (i >= out_w || j >= out_h) return;
+
+    const float pi = 3.14159265f;
+    float lat = (0.5f - j / (float)(out_h - 1)) * pi;
+    float lon = (i * (2.0f / (float)(out_w - 1)) - 1.0f) * pi;
+    float sin_lat, cos_lat, sin_lon, cos_lon;
+    sincosf(lat, &sin_lat, &cos_lat);
+    sincosf(lon, &sin_lon, &cos_lon);
+    float dx = cos_lat * sin_lon, dy = sin_lat, dz = cos_lat * cos_lon;
+    float adx = fabsf(dx), ady = fabsf(dy), adz = fabsf(dz);
+
+    int fi;
+    float u, v;
+    if (adx >= ady && adx >= adz) {
+        if (dx > 0) { fi = 2; u = -dz / dx; v =  dy / dx; }   // r
+        else        { fi = 3; u = -dz / dx; v = -dy / dx; }   // l
+    } else if (ady >= adz) {
+        if (dy > 0) { fi = 4; u =  dx / dy; v = -dz / dy; }   // u
+        else        { fi = 5; u = -dx / dy; v = -dz / dy; }   // d
+    } else if (dz < 0) {
+        fi = 1; u = dx / dz; v = -dy / dz;                    // b
+    } else {
+        fi = 0; u = dx / dz; v =  dy / dz;                    // f
+    }
+
+    float s1 = (float)(size - 1);
+    float px = (u + 1.0f) * 0.5f * s1;
+    float py = (1.0f - v) * 0.5f * s1;
+    float fx = floorf(px);
+    float fy = floorf(py);
+    int wx = (int)((px - fx) * 256.0f + 0.5f);
+    int wy = (int)((py - fy) * 256.0f + 0.5f);
+
+    // Clamp (cube faces don't wrap)
+    int x0 = min(max((int)fx, 0), size - 1);
+    int y0 = min(max((int)fy, 0), size - 1);
+    int x1 = min(x0 + 1, size - 1);
+    int y1 = min(y0 + 1, size - 1);
+
+    const unsigned char* face = faces + (long long)fi * size * size * 3;
+    const unsigned char* r0 = face + (long long)y0 * size * 3;
+    const unsigned char* r1 = face + (long long)y1 * size * 3;
+    unsigned char* o = out + ((long long)j * out_w + i) * 3;
+    for (int c = 0; c < 3; ++c) {
+        int top = (r0[x0 * 3 + c] * (256 - wx) + r0[x1 * 3 + c] * wx + 128) >> 8;
+        int bot = (r1[x0 * 3 + c] * (256 - wx) + r1[x1 * 3 + c] * wx + 128) >> 8;
+        o[c] = (unsigned char)((top * (256 - wy) + bot * wy) >> 8);
+    }
+}
+"""
+
+if HAVE_CUPY:
+    _project_equirect_cuda = cp.RawKernel(_CUDA_SRC, 'project_equirect')   # compiled on first launch
+
+
+def faces_to_equirect(faces: np.ndarray | dict[str, np.ndarray],
+                      out_w: int, out_h: int,
+                      out: np.ndarray | None = None) -> np.ndarray:
     """
     Reconstruct an equirectangular image from six cube faces.
 
-    face_imgs: dict mapping face key → (size, size, 3) uint8 numpy array.
-               All six faces must be square and the same size.
+    faces: (6, size, size, 3) uint8 stack in FACES order, or a dict mapping
+           face key → (size, size, 3) uint8 numpy array.
+           All six faces must be square and the same size.
     out_w, out_h: output dimensions (pixels).
+    out: optional C-contiguous (out_h, out_w, 3) uint8 array to write into.
 
-    Returns: (out_h, out_w, 3) uint8 numpy array.
+    Returns: (out_h, out_w, 3) uint8 numpy array (*out* if given).
 
     Coordinate system (right-handed, krpano): +Z=front, +X=right, +Y=up.
 
@@ -136,73 +355,150 @@ def faces_to_equirect(face_imgs: dict[str, np.ndarray],
         u : u =  dx/dy,   v = -dz/dy   (dy > 0)
         d : u = -dx/dy,   v = -dz/dy   (dy < 0)
     UV ∈ [-1, +1]; face pixel = (u+1)/2*(size-1), (1-v)/2*(size-1).
-    """
-    face_size = next(iter(face_imgs.values())).shape[0]
 
-    # ── Longitude / latitude grids for every output pixel ─────────────────
-    cols = np.arange(out_w, dtype=np.float32)
-    rows = np.arange(out_h, dtype=np.float32)
-    col_grid, row_grid = np.meshgrid(cols, rows)   # (out_h, out_w)
-    del cols, rows
-
-    lon = (col_grid / np.float32(out_w - 1) * np.float32(2.0) - np.float32(1.0)) * np.float32(math.pi)
-    lat = (np.float32(0.5) - row_grid / np.float32(out_h - 1)) * np.float32(math.pi)
-    del col_grid, row_grid
+    Runs on a CUDA GPU via CuPy when available, else the fused Numba
+    kernel, else the NumPy path.
+    """
+    global HAVE_CUPY
+    if isinstance(faces, dict):
+        faces = np.stack([faces[f] for f in FACES])
+    faces = np.ascontiguousarray(faces)   # the samplers index it as flat pixels
+    if out is None:
+        out = np.empty((out_h, out_w, 3), dtype=np.uint8)
+
+    if HAVE_CUPY and _gpu_available():
+        try:
+            _faces_to_equirect_gpu(faces, out)
+            return out
+        except Exception as exc:    # NVRTC compile, driver or out-of-memory error
+            print(f"WARNING: GPU projection failed ({exc}); using the CPU from now on",
+                  file=sys.stderr)
+            HAVE_CUPY = False
 
-    # ── 3-D unit direction vector ──────────────────────────────────────────
-    cos_lat = np.cos(lat).astype(np.float32)
-    dx = (cos_lat * np.sin(lon)).astype(np.float32)
-    dy = np.sin(lat).astype(np.float32)
-    dz = (cos_lat * np.cos(lon)).astype(np.float32)
-    del lon, lat, cos_lat
+    if HAVE_NUMBA:
+        lon = (np.arange(out_w, dtype=np.float32) * np.float32(2.0 / (out_w - 1))
+               - np.float32(1.0)) * np.float32(math.pi)
+        _project_equirect(faces, np.sin(lon), np.cos(lon), out)
+    else:
+        _faces_to_equirect_np(faces, out)
+    return out
 
-    # ── Face assignment by dominant axis ──────────────────────────────────
-    abs_dx = np.abs(dx)
-    abs_dy = np.abs(dy)
-    abs_dz = np.abs(dz)
 
-    x_dom = (abs_dx >= abs_dy) & (abs_dx >= abs_dz)
-    y_dom = ~x_dom & (abs_dy >= abs_dz)
-    z_dom = ~x_dom & ~y_dom
+# Serialises GPU projection across the --jobs workers: each launch holds a
+# panorama's faces and output on the device.  Handed to the workers by the
+# pool initializer (_set_gpu_lock).
+_gpu_lock = None
 
-    # 0=f 1=b 2=r 3=l 4=u 5=d
-    face_idx = np.zeros((out_h, out_w), dtype=np.int8)
-    face_idx[z_dom & (dz < 0)] = 1   # b
-    face_idx[x_dom & (dx > 0)] = 2   # r
-    face_idx[x_dom & (dx < 0)] = 3   # l
-    face_idx[y_dom & (dy > 0)] = 4   # u
-    face_idx[y_dom & (dy < 0)] = 5   # d
-    del abs_dx, abs_dy, abs_dz, x_dom, y_dom, z_dom
 
-    # ── UV coordinate arrays (filled per face) ─────────────────────────────
-    uv_u = np.empty((out_h, out_w), dtype=np.float32)
-    uv_v = np.empty((out_h, out_w), dtype=np.float32)
+def _set_gpu_lock(lock) -> None:
+    """Pool initializer: install the lock shared by all stitching workers."""
+    global _gpu_lock
+    _gpu_lock = lock
 
-    # Front (0): u = dx/dz,  v = dy/dz   (dz > 0)
-    m = face_idx == 0
-    uv_u[m] = dx[m] / dz[m];   uv_v[m] = dy[m] / dz[m]
 
-    # Back (1): u = dx/dz,  v = -dy/dz  (dz < 0)
-    m = face_idx == 1
-    uv_u[m] = dx[m] / dz[m];   uv_v[m] = -dy[m] / dz[m]
+@functools.cache
+def _gpu_available() -> bool:
+    """True if CuPy sees a CUDA device."""
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:   # no driver / no device
+        return False
 
-    # Right (2): u = -dz/dx, v = dy/dx  (dx > 0)
-    m = face_idx == 2
-    uv_u[m] = -dz[m] / dx[m];  uv_v[m] = dy[m] / dx[m]
 
-    # Left (3): u = -dz/dx, v = -dy/dx  (dx < 0)
-    m = face_idx == 3
-    uv_u[m] = -dz[m] / dx[m];  uv_v[m] = -dy[m] / dx[m]
+def _faces_to_equirect_gpu(faces: np.ndarray, out: np.ndarray) -> None:
+    """
+    CUDA projection (CuPy) into *out*; device memory is released before
+    returning.  --jobs workers take turns (_gpu_lock), so only one panorama
+    is on the device at a time.
+    """
+    out_h, out_w = out.shape[:2]
+    d_faces = d_out = None
+    with _gpu_lock if _gpu_lock is not None else contextlib.nullcontext():
+        try:
+            d_faces = cp.asarray(faces)
+            d_out = cp.empty((out_h, out_w, 3), dtype=cp.uint8)
+            grid = ((out_w + 15) // 16, (out_h + 15) // 16)
+            _project_equirect_cuda(grid, (16, 16), (d_faces, np.int32(d_faces.shape[1]),
+                                                    d_out, np.int32(out_w), np.int32(out_h)))
+            d_out.get(out=out)
+        finally:
+            del d_faces, d_out
+            cp.get_default_memory_pool().free_all_blocks()
+
+
+def _faces_to_equirect_np(faces: np.ndarray, out: np.ndarray) -> None:
+    """
+    Vectorised NumPy inverse projection into *out* (fallback when Numba is
+    not installed).
 
-    # Up (4): u = dx/dy,  v = -dz/dy    (dy > 0)
-    m = face_idx == 4
-    uv_u[m] = dx[m] / dy[m];   uv_v[m] = -dz[m] / dy[m]
+    The output is produced in stripes of ROW_STRIPE rows so the per-pixel
+    intermediates stay cache-sized instead of spanning the whole panorama.
+    """
+    # lon depends only on the column and lat only on the row, so the trig
+    # runs once per column or row; broadcasting builds the 2-D direction
+    # arrays for each stripe.
+    out_h, out_w = out.shape[:2]
+    cols = np.arange(out_w, dtype=np.float32)[np.newaxis, :]
+    rows = np.arange(out_h, dtype=np.float32)[:, np.newaxis]
+    lon = (cols / np.float32(out_w - 1) * np.float32(2.0) - np.float32(1.0)) * np.float32(math.pi)
+    lat = (np.float32(0.5) - rows / np.float32(out_h - 1)) * np.float32(math.pi)
+    sin_lon = np.sin(lon)                                 # (1, out_w)
+    cos_lon = np.cos(lon)                                 # (1, out_w)
+    del cols, rows, lon
+
+    for r0 in range(0, out_h, ROW_STRIPE):
+        r1 = min(r0 + ROW_STRIPE, out_h)
+        _project_rows_np(faces, out[r0:r1], lat[r0:r1], sin_lon, cos_lon)
+
+
+def _project_rows_np(faces: np.ndarray, out: np.ndarray,
+                     lat: np.ndarray, sin_lon: np.ndarray,
+                     cos_lon: np.ndarray) -> None:
+    """Project one stripe of output rows (latitudes *lat*, shape (n, 1)) into *out*."""
+    face_size = faces.shape[1]
+    out_h, out_w = out.shape[:2]
 
-    # Down (5): u = -dx/dy, v = -dz/dy  (dy < 0)
-    m = face_idx == 5
-    uv_u[m] = -dx[m] / dy[m];  uv_v[m] = -dz[m] / dy[m]
+    # ── 3-D unit direction vector ──────────────────────────────────────────
+    cos_lat = np.cos(lat)                                 # (out_h, 1)
+    sin_lat = np.sin(lat)                                 # (out_h, 1)
+    dx = cos_lat * sin_lon                                # (out_h, out_w)
+    dy = np.broadcast_to(sin_lat, (out_h, out_w))         # read-only view
+    dz = cos_lat * cos_lon                                # (out_h, out_w)
+    del cos_lat
 
-    del dx, dy, dz, m
+    # ── Face assignment by dominant axis ──────────────────────────────────
+    abs_dx = np.abs(dx)
+    abs_dy = np.abs(sin_lat)
+    abs_dz = np.abs(dz)
+    del sin_lat
+
+    # Dominant axis 0=x 1=y 2=z as the sum of two comparison bits, with no
+    # selects; ties resolve x before y before z.
+    not_x = (abs_dx < abs_dy) | (abs_dx < abs_dz)
+    is_z = not_x & (abs_dy < abs_dz)
+    del abs_dx, abs_dy, abs_dz
+    axis = not_x.view(np.int8) + is_z.view(np.int8)
+    is_x = ~not_x
+    is_y = not_x ^ is_z
+    del not_x, is_z
+
+    # ── UV coordinates ─────────────────────────────────────────────────────
+    # One reciprocal of the dominant component serves every face.  The u
+    # numerator is dz on r/l and dx elsewhere, v's is dz on u/d and dy
+    # elsewhere; the per-face signs come from the tables above.
+    inv = np.where(is_x, dx, np.where(is_y, dy, dz))
+    face_idx = AXIS_FACE[axis]                            # 0=f 1=b 2=r 3=l 4=u 5=d
+    face_idx += np.signbit(inv)
+    np.reciprocal(inv, out=inv)
+    del axis
+
+    uv_u = np.where(is_x, dz, dx)
+    uv_u *= inv
+    uv_u *= U_SIGN[face_idx]
+    uv_v = np.where(is_y, dz, dy)
+    uv_v *= inv
+    uv_v *= V_SIGN[face_idx]
+    del dx, dy, dz, is_x, is_y, inv
 
     # UV → face pixel coordinates
     fs_f32 = np.float32(face_size - 1)
@@ -210,103 +506,218 @@ def faces_to_equirect(face_imgs: dict[str, np.ndarray],
     py = (np.float32(1.0) - uv_v) * np.float32(0.5) * fs_f32   # row in face
     del uv_u, uv_v
 
-    # ── Sample from each face ──────────────────────────────────────────────
-    result = np.zeros((out_h, out_w, 3), dtype=np.uint8)
+    # ── Bilinear sample from the face stack ────────────────────────────────
+    # Indexing the (6, size, size, 3) stack with face_idx alongside the pixel
+    # coordinates samples every face in one pass, with no per-face split.
+    # Pixel coordinates are int16 whenever the face size allows it.
+    coord_t = np.int16 if face_size <= np.iinfo(np.int16).max else np.int32
+    x0 = np.floor(px).astype(coord_t)
+    y0 = np.floor(py).astype(coord_t)
+    # Q0.8 fixed-point weights (0‥256), shaped (…, 1) to broadcast over RGB
+    wx = ((px - x0) * np.float32(256.0) + np.float32(0.5)).astype(np.uint16)[..., np.newaxis]
+    wy = ((py - y0) * np.float32(256.0) + np.float32(0.5)).astype(np.uint16)[..., np.newaxis]
+    del px, py
+
+    # Clamp (cube faces don't wrap)
+    x1 = np.clip(x0 + 1, 0, face_size - 1)
+    y1 = np.clip(y0 + 1, 0, face_size - 1)
+    x0 = np.clip(x0, 0, face_size - 1)
+    y0 = np.clip(y0, 0, face_size - 1)
+
+    # One gather for all four corners: the flat pixel index of the top-left
+    # corner in the (6·size·size, 3) stack, plus the per-pixel offsets of
+    # the other three (the clamped steps, 0 or 1 pixel / 0 or 1 row).
+    base = face_idx * np.intp(face_size) + y0
+    del face_idx
+    base *= face_size
+    base += x0
+    step_x = x1 - x0
+    step_y = (y1 - y0) * np.intp(face_size)
+    del x0, x1, y0, y1
+    idx = np.empty(base.shape + (4,), dtype=np.intp)
+    idx[..., 0] = base
+    np.add(base, step_x, out=idx[..., 1])
+    np.add(base, step_y, out=idx[..., 2])
+    np.add(idx[..., 2], step_x, out=idx[..., 3])
+    del base, step_x, step_y
+    corners = np.take(faces.reshape(-1, 3), idx, axis=0)   # (…, 4, 3): c00 c10 c01 c11
+    del idx
+
+    # Separable blend as in the Numba kernel: two horizontal lerps, then one
+    # vertical.  a·(256-w) + b·w never exceeds 255·256, so uint16 holds it.
+    iwx = 256 - wx
+    top = corners[..., 0, :].astype(np.uint16)
+    top *= iwx
+    top += corners[..., 1, :] * wx
+    top += 128
+    top >>= 8
+    bot = corners[..., 2, :].astype(np.uint16)
+    bot *= iwx
+    bot += corners[..., 3, :] * wx
+    bot += 128
+    bot >>= 8
+    del corners, iwx
+
+    top *= 256 - wy
+    bot *= wy
+    top += bot
+    top >>= 8
+    out[...] = top
+
+
+# ── Output ────────────────────────────────────────────────────────────────────
+
+def save_tiff(path: str, img_np: np.ndarray) -> None:
+    """
+    Write an (H, W, 3) uint8 array as an uncompressed RGB TIFF.
 
-    face_list = [('f', 0), ('b', 1), ('r', 2), ('l', 3), ('u', 4), ('d', 5)]
-    for face_key, fi in face_list:
-        mask = face_idx == fi
-        if not np.any(mask):
-            continue
+    tifffile writes the array's buffer as is; Pillow, the fallback, first
+    copies it into an image and encodes it strip by strip.  Both switch to
+    BigTIFF for outputs too large for classic TIFF's 32-bit offsets.
+    """
+    bigtiff = img_np.nbytes >= BIGTIFF_THRESHOLD
+    if HAVE_TIFFFILE:
+        tifffile.imwrite(path, img_np, photometric='rgb', bigtiff=bigtiff)
+    else:
+        Image.fromarray(img_np).save(path, format='TIFF', big_tiff=bigtiff)
 
-        face_np = face_imgs[face_key]
-        px_m = px[mask]
-        py_m = py[mask]
 
-        x0 = np.floor(px_m).astype(np.int32)
-        y0 = np.floor(py_m).astype(np.int32)
-        wx = (px_m - x0.astype(np.float32))
-        wy = (py_m - y0.astype(np.float32))
+# ── Main processing ───────────────────────────────────────────────────────────
+
+# The face stack and output image of the last panorama, kept for the next one
+# of the same size so a batch does not allocate and free them every time
+_scratch: dict[str, np.ndarray] = {}
 
-        # Clamp (cube faces don't wrap)
-        x1 = np.clip(x0 + 1, 0, face_size - 1)
-        y1 = np.clip(y0 + 1, 0, face_size - 1)
-        x0 = np.clip(x0, 0, face_size - 1)
-        y0 = np.clip(y0, 0, face_size - 1)
 
-        c00 = face_np[y0, x0].astype(np.float32)
-        c10 = face_np[y0, x1].astype(np.float32)
-        c01 = face_np[y1, x0].astype(np.float32)
-        c11 = face_np[y1, x1].astype(np.float32)
-        del x0, x1, y0, y1
+def _scratch_array(name: str, shape: tuple[int, ...]) -> np.ndarray:
+    """Uninitialised uint8 array of *shape*, reused across panoramas."""
+    arr = _scratch.pop(name, None)
+    if arr is None or arr.shape != shape:
+        del arr                     # free the old size before allocating
+        arr = np.empty(shape, dtype=np.uint8)
+    _scratch[name] = arr
+    return arr
 
-        wx = wx[:, np.newaxis]
-        wy = wy[:, np.newaxis]
-        sampled = (c00 * (1.0 - wx) * (1.0 - wy)
-                   + c10 * wx * (1.0 - wy)
-                   + c01 * (1.0 - wx) * wy
-                   + c11 * wx * wy).astype(np.uint8)
-        del c00, c10, c01, c11, wx, wy
 
-        result[mask] = sampled
+def _decode_face(img: Image.Image, dst: np.ndarray) -> None:
+    """
+    Decode one opened face into its (size, size, 3) slot of the face stack,
+    then close it so any decoded copy Pillow holds is freed straight away.
 
-    del face_idx, px, py
-    return result
+    JPEGs are decoded by libjpeg-turbo straight into *dst*.  Other formats,
+    or JPEGs it rejects, go through Pillow.
+    """
+    if _tj is not None and img.format == 'JPEG':
+        with open(img.filename, 'rb') as fh:
+            data = fh.read()
+        try:
+            _tj.decode(data, pixel_format=TJPF_RGB, dst=dst)
+        except Exception:   # e.g. CMYK — let Pillow convert it
+            pass
+        else:
+            img.close()
+            return
 
+    dst[...] = np.asarray(img if img.mode == 'RGB' else img.convert('RGB'))
+    img.close()
 
-# ── Main processing ───────────────────────────────────────────────────────────
 
 def process_panorama(directory: str, prefix: str,
-                     face_paths: dict[str, str]) -> bool:
+                     face_paths: dict[str, str], jobs: int = 1) -> bool:
     out_path = os.path.join(directory, f"{prefix}.tif")
     print(f"\nStitching: {prefix}")
-    print(f"Output:    {out_path}")
-
-    # Load all six faces
-    face_imgs: dict[str, np.ndarray] = {}
-    face_size: int | None = None
-
-    for face in FACES:
-        path = face_paths[face]
-        print(f"  Loading [{face}] {os.path.basename(path)} … ", end='', flush=True)
-        img = Image.open(path).convert('RGB')
-        w, h = img.size
-        if w != h:
-            print(f"\nERROR: face '{face}' is not square ({w}×{h})", file=sys.stderr)
-            return False
-        if face_size is None:
-            face_size = w
-        elif w != face_size:
-            print(f"\nERROR: face '{face}' size {w} differs from expected {face_size}",
-                  file=sys.stderr)
-            return False
-        face_imgs[face] = np.array(img)
-        img.close()
-        print("done")
+
+    # Under --jobs several workers share the terminal: every line carries
+    # the panorama's name and is printed whole, never left half-finished.
+    tag = f"[{prefix}] " if jobs > 1 else ""
+
+    def say(msg: str) -> None:
+        print(f"  {tag}{msg}", flush=True)
+
+    def step(msg: str) -> None:
+        if jobs > 1:
+            say(f"{msg} …")
+        else:
+            print(f"  {msg} … ", end='', flush=True)
+
+    def done() -> None:
+        if jobs == 1:
+            print("done")
+
+    print(f"{tag}Output:    {out_path}")
+
+    if HAVE_NUMBA and jobs > 1:
+        # Share the cores with the other panoramas in flight
+        set_num_threads(max(1, get_num_threads() // jobs))
+
+    # Open all six faces (headers only) and check their sizes before decoding
+    imgs: list[Image.Image] = []
+    try:
+        for face in FACES:
+            path = face_paths[face]
+            say(f"Loading [{face}] {os.path.basename(path)}")
+            img = Image.open(path)
+            imgs.append(img)
+            w, h = img.size
+            if w != h:
+                print(f"ERROR: {tag}face '{face}' is not square ({w}×{h})", file=sys.stderr)
+                return False
+            if w != imgs[0].size[0]:
+                print(f"ERROR: {tag}face '{face}' size {w} differs from expected {imgs[0].size[0]}",
+                      file=sys.stderr)
+                return False
+        face_size = imgs[0].size[0]
+
+        # Decode them in parallel straight into one (6, size, size, 3) stack,
+        # which is what every projection path consumes.  Pillow's decoders
+        # release the GIL, so threads are enough; each one holds a decoded
+        # face of its own, so there are no more of them than cores.
+        step("Decoding")
+        faces = _scratch_array('faces', (len(FACES), face_size, face_size, 3))
+        threads = max(1, min(len(FACES), (os.cpu_count() or 1) // jobs))
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(_decode_face, imgs, faces))
+        done()
+    finally:
+        for img in imgs:
+            img.close()
 
     out_w = round(face_size * math.pi)
     if out_w % 2 != 0:
         out_w += 1          # width must be even to guarantee exact 2:1 ratio
     out_h = out_w // 2
-    print(f"  Face size:   {face_size} × {face_size} px")
-    print(f"  Output size: {out_w} × {out_h} px")
-    print(f"  Projecting … ", end='', flush=True)
+    say(f"Face size:   {face_size} × {face_size} px")
+    say(f"Output size: {out_w} × {out_h} px")
+    step("Projecting")
 
-    result_np = faces_to_equirect(face_imgs, out_w, out_h)
-    del face_imgs
-    print("done")
+    result_np = faces_to_equirect(faces, out_w, out_h,
+                                  out=_scratch_array('result', (out_h, out_w, 3)))
+    del faces
+    done()
 
-    print(f"  Saving … ", end='', flush=True)
-    Image.fromarray(result_np).save(out_path, format='TIFF')
+    step("Saving")
+    save_tiff(out_path, result_np)
     del result_np
-    print("done")
+    done()
 
-    print(f"Done → {out_path}\n")
+    print(f"{tag}Done → {out_path}\n")
     return True
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
+def _run_one(panorama: tuple[str, str, dict[str, str]], jobs: int = 1) -> bool:
+    """process_panorama with errors reported instead of raised (runs in --jobs workers)."""
+    directory, prefix, face_paths = panorama
+    try:
+        return process_panorama(directory, prefix, face_paths, jobs)
+    except Exception as exc:
+        print(f"ERROR stitching {prefix}: {exc}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         prog='tosphere.py',
@@ -319,6 +730,9 @@ def main() -> None:
         ),
     )
     parser.add_argument('faces', nargs='+', help='Path(s) to cube-face image(s)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=max(1, (os.cpu_count() or 1) // len(FACES)),
+                        help='panoramas to stitch in parallel (default: one per %d cores)' % len(FACES))
     args = parser.parse_args()
 
     panoramas = collect_panoramas(args.faces)
@@ -326,16 +740,17 @@ def main() -> None:
         print("ERROR: no valid panorama sets found.", file=sys.stderr)
         sys.exit(1)
 
-    failed = 0
-    for directory, prefix, face_paths in panoramas:
-        try:
-            if not process_panorama(directory, prefix, face_paths):
-                failed += 1
-        except Exception as exc:
-            print(f"ERROR stitching {prefix}: {exc}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-            failed += 1
+    jobs = max(1, min(args.jobs, len(panoramas)))
+    if jobs > 1:
+        if HAVE_NUMBA:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                pool.submit(_compile_kernel).result()
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_set_gpu_lock,
+                                 initargs=(multiprocessing.Lock(),)) as pool:
+            results = list(pool.map(_run_one, panoramas, [jobs] * len(panoramas)))
+    else:
+        results = [_run_one(panorama) for panorama in panoramas]
+    failed = results.count(False)
 
     sys.exit(1 if failed else 0)
 